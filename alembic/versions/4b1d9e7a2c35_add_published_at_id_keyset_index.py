@@ -0,0 +1,33 @@
+"""add published_at id keyset index
+
+Revision ID: 4b1d9e7a2c35
+Revises: ef8077226530
+Create Date: 2026-10-18 10:12:40.318254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b1d9e7a2c35'
+down_revision: Union[str, Sequence[str], None] = 'ef8077226530'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_articles_published_at_id',
+        'articles',
+        [sa.text('published_at DESC NULLS LAST'), sa.text('id DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_articles_published_at_id', table_name='articles')
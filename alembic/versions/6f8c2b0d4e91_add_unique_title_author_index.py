@@ -0,0 +1,41 @@
+"""add unique title author index
+
+Revision ID: 6f8c2b0d4e91
+Revises: d27a5f4e8b10
+Create Date: 2026-10-18 14:20:05.671139
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f8c2b0d4e91'
+down_revision: Union[str, Sequence[str], None] = 'd27a5f4e8b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Duplicates could be written before the index existed, the old check-then-insert
+    # was racy. Stop with the offending pairs rather than fail inside CREATE INDEX.
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT title, author, array_agg(id ORDER BY id) AS ids FROM articles "
+        "GROUP BY title, author HAVING count(*) > 1 ORDER BY title, author LIMIT 20"
+    )).all()
+    if duplicates:
+        listed = "\n".join(f"  {row.title!r} by {row.author!r}: ids {row.ids}" for row in duplicates)
+        raise RuntimeError(
+            "Cannot add uq_articles_title_author, articles repeat a (title, author) pair "
+            f"(first {len(duplicates)} shown):\n{listed}\n"
+            "Delete or rename the extra rows and run the migration again."
+        )
+    op.create_index('uq_articles_title_author', 'articles', ['title', 'author'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_articles_title_author', table_name='articles')
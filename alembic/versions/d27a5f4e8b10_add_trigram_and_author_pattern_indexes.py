@@ -0,0 +1,37 @@
+"""add trigram and author pattern indexes
+
+Revision ID: d27a5f4e8b10
+Revises: 9e3f0c6d81a4
+Create Date: 2026-10-18 11:48:52.907361
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd27a5f4e8b10'
+down_revision: Union[str, Sequence[str], None] = '9e3f0c6d81a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('ix_articles_title_trgm', 'articles', ['title'], unique=False, postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+    op.create_index('ix_articles_author_trgm', 'articles', ['author'], unique=False, postgresql_using='gin', postgresql_ops={'author': 'gin_trgm_ops'})
+    op.create_index('ix_articles_body_trgm', 'articles', ['body'], unique=False, postgresql_using='gin', postgresql_ops={'body': 'gin_trgm_ops'})
+    op.create_index('ix_articles_author_pattern', 'articles', ['author'], unique=False, postgresql_ops={'author': 'varchar_pattern_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_articles_author_pattern', table_name='articles')
+    op.drop_index('ix_articles_body_trgm', table_name='articles', postgresql_using='gin')
+    op.drop_index('ix_articles_author_trgm', table_name='articles', postgresql_using='gin')
+    op.drop_index('ix_articles_title_trgm', table_name='articles', postgresql_using='gin')
+    # Nothing else in the schema uses pg_trgm; without CASCADE this fails rather than drop foreign objects
+    op.execute("DROP EXTENSION IF EXISTS pg_trgm")
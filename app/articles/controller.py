@@ -1,176 +1,745 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 from fastapi import HTTPException, status
-from app.models.article import Article
+from app.models.article import Article, SEARCH_CONFIG, UNIQUE_TITLE_AUTHOR
 from app.articles.schema import (
-    ArticleCreate, 
-    ArticleResponse, 
+    ARTICLE_FIELDS,
+    ArticleBatch,
+    ArticleCreate,
+    AuthorMatch,
+    ArticleResponse,
+    ArticleSummary,
     ArticleUpdate,
+    BulkCreateItem,
+    ExportFormat,
+    BulkCreateResult,
+    BulkItemStatus,
     PaginatedArticles,
 )
+from app.config.database import REPLICA_STICKY_SECONDS, ReplicaSessionLocals, read_sessionmaker
 from app.services import cache_service
+from app.utils.http_utils import make_etag
+from app.utils.pagination_utils import decode_cursor, encode_cursor
+import asyncio
+import csv
+import io
+import json
 import logging
-from typing import Optional, List
+import time
+from datetime import datetime
+from typing import AsyncIterator, NoReturn, Optional, List, Tuple, Union
 
 
-async def create_article(db: Session, article: ArticleCreate) -> ArticleResponse:
-    db_article = db.query(Article).filter(
-        (Article.title == article.title) & (Article.author == article.author)
-    ).first()
+logger = logging.getLogger(__name__)
 
-    if db_article:
-        logging.warn(f"Attempt to create duplicate article: {article.title} by {article.author}")
+# Short TTL on cached list and search pages, writes invalidate them sooner
+# by bumping the "articles" generation
+LIST_CACHE_TTL = 30
+
+ARTICLE_CACHE_TTL = 120
+# Replicas may trail a write this long, the window the read_primary cookie covers.
+# Pages read from a replica within it are not cached, they could predate the write.
+GENERATION_SETTLE_SECONDS = REPLICA_STICKY_SECONDS if ReplicaSessionLocals else 0
+# Moving average of how long an article reload takes, feeds early refresh
+_article_load_seconds = 0.01
+# Keeps background refreshes referenced until they finish
+_refresh_tasks: "set[asyncio.Task]" = set()
+
+
+# Rows fetched per round trip of the export's server-side cursor
+EXPORT_BATCH_SIZE = 500
+EXPORT_CSV_COLUMNS = ["id", "title", "author", "tags", "published_at", "created_at", "updated_at", "body"]
+
+
+# Newest first; id breaks ties so the order is total and usable as a keyset
+ARTICLE_ORDER = (Article.published_at.desc().nulls_last(), Article.id.desc())
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Validate a comma-separated fields= value, None means every field."""
+    if not fields:
+        return None
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in selected if field not in ARTICLE_FIELDS and field != "id"]
+    if unknown:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Article with title '{article.title}' by author '{article.author}' already exists.",
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed fields: {', '.join(ARTICLE_FIELDS)}.",
         )
-    
-    new_article = Article(**article.model_dump())
-    db.add(new_article)
-    db.commit()
-    db.refresh(new_article)
+    # Keep the declared column order so equal selections share a cache key
+    return [field for field in ARTICLE_FIELDS if field in selected]
 
-    # Serialize the new article to JSON for caching
-    article_schema = ArticleResponse.from_orm(new_article)
 
-    # Set cache for the new article
-    await cache_service.set_cache("article", new_article.id, article_schema.model_dump_json())
-    logging.info(f"Article created with ID: {new_article.id}")
+def _project(query, fields: Optional[List[str]]):
+    """Load only the selected columns, leaving the rest (notably body) unread.
 
-    return article_schema
+    published_at and id are always loaded, the next cursor is built from them;
+    _to_list_item leaves them out of the response unless they were selected.
+    """
+    if fields is None:
+        return query
+    loaded = dict.fromkeys([*fields, "published_at", "id"])
+    return query.options(load_only(*(getattr(Article, field) for field in loaded)))
 
 
-def get_articles(
-        db: Session, 
-        page: int,
-        page_size: int,
+def _to_list_item(article: Article, fields: Optional[List[str]]) -> Union[ArticleResponse, ArticleSummary]:
+    if fields is None:
+        return ArticleResponse.from_orm(article)
+    # Only touch loaded attributes, an unloaded one would trigger a lazy load
+    return ArticleSummary(id=article.id, **{field: getattr(article, field) for field in fields})
+
+
+def _filter_articles(
+        query,
         title: Optional[str] = None,
         author: Optional[str] = None,
+        author_match: AuthorMatch = AuthorMatch.contains,
         tags: Optional[List[str]] = None,
         content: Optional[str] = None
-    ) -> PaginatedArticles:
-    query = db.query(Article)
-
+    ):
     if title:
         query = query.filter(Article.title.ilike(f"%{title}%"))
     if author:
-        query = query.filter(Article.author.ilike(f"%{author}%"))
+        # prefix and exact are case-sensitive so they can use the B-tree indexes on author
+        if author_match == AuthorMatch.exact:
+            query = query.filter(Article.author == author)
+        elif author_match == AuthorMatch.prefix:
+            query = query.filter(Article.author.startswith(author, autoescape=True))
+        else:
+            query = query.filter(Article.author.ilike(f"%{author}%"))
     if tags and isinstance(tags, list):
         query = query.filter(Article.tags.overlap(tags))
     if content:
         query = query.filter(Article.body.ilike(f"%{content}%"))
 
-    offset = (page - 1) * page_size
+    return query
+
+
+async def _fetch_page(
+        db: AsyncSession,
+        query,
+        page: int,
+        page_size: int,
+        cursor: Optional[str] = None,
+        count: bool = True
+    ) -> Tuple[List[Article], Optional[str], Optional[int]]:
+    """Fetch one page ordered by (published_at, id), by offset or by cursor.
+
+    In cursor mode the page starts right after the (published_at, id) key
+    encoded in the cursor, so it is served by ix_articles_published_at_id
+    at the same cost whatever its depth. Articles without published_at sort
+    last and are walked by id once the dated ones run out.
+
+    With count, the filtered total rides along as a scalar subquery in the
+    page statement itself; only an empty page needs a separate COUNT.
+    """
+    count_query = query.with_only_columns(func.count(), maintain_column_froms=True)
+    total = None
+
+    async def fetch(statement, limit: int) -> List[Article]:
+        nonlocal total
+        with_total = count and total is None
+        if with_total:
+            statement = statement.add_columns(count_query.correlate(None).scalar_subquery())
+        result = await db.execute(statement.limit(limit))
+        rows = result.all()
+        if with_total and rows:
+            total = rows[0][1]
+        return [row[0] for row in rows]
+
+    if cursor is None:
+        articles = await fetch(
+            query.order_by(*ARTICLE_ORDER).offset((page - 1) * page_size),
+            page_size + 1,
+        )
+    else:
+        published_at, article_id = decode_cursor(cursor, datetime, int)
+        articles = []
+        if published_at is not None:
+            articles = await fetch(
+                query
+                .filter(tuple_(Article.published_at, Article.id) < (published_at, article_id))
+                .order_by(*ARTICLE_ORDER),
+                page_size + 1,
+            )
+            # If the dated articles run out, the undated ones follow from the top
+            article_id = None
+        if len(articles) <= page_size:
+            undated = query.filter(Article.published_at.is_(None))
+            if article_id is not None:
+                undated = undated.filter(Article.id < article_id)
+            articles.extend(await fetch(
+                undated.order_by(Article.id.desc()),
+                page_size + 1 - len(articles),
+            ))
+
+    if count and total is None:
+        total = await db.scalar(count_query)
+
+    if len(articles) <= page_size:
+        return articles, None, total
+
+    articles = articles[:page_size]
+    last = articles[-1]
+    return articles, encode_cursor(last.published_at, last.id), total
+
 
-    articles = (
-        query
-        .order_by(Article.published_at.desc())
-        .offset(offset)
-        .limit(page_size)
-        .all()
+async def _estimate_article_count(db: AsyncSession) -> Optional[int]:
+    """Row count estimate kept by ANALYZE/autovacuum, None if never analyzed."""
+    estimate = await db.scalar(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+        {"table": Article.__tablename__},
     )
+    if estimate is None or estimate < 0:
+        return None
+    return estimate
 
-    total_articles = db.query(Article).count()
 
-    return PaginatedArticles(
-        total=total_articles,
+async def create_article(db: AsyncSession, article: ArticleCreate) -> ArticleResponse:
+    # One round trip: the unique (title, author) index turns a duplicate into an empty RETURNING
+    new_article = await db.scalar(
+        insert(Article)
+        .values(**article.model_dump())
+        .on_conflict_do_nothing(index_elements=[Article.title, Article.author])
+        .returning(Article)
+    )
+
+    if new_article is None:
+        await db.rollback()
+        logger.warning("Attempt to create duplicate article: %s by %s", article.title, article.author)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Article with title '{article.title}' by author '{article.author}' already exists.",
+        )
+
+    # Serialize the new article to JSON for caching
+    article_schema = ArticleResponse.from_orm(new_article)
+    await db.commit()
+
+    # Set cache for the new article, replacing any tombstone left by lookups of its id
+    await cache_service.set_cache("article", new_article.id, article_schema.model_dump_json(), expire=ARTICLE_CACHE_TTL)
+    await _bump_generation()
+    logger.info("Article created with ID: %s", new_article.id)
+
+    return article_schema
+
+
+async def bulk_create_articles(db: AsyncSession, articles: List[ArticleCreate]) -> BulkCreateResult:
+    # Only the first occurrence of a (title, author) pair in the batch is inserted
+    first_index = {}
+    for index, article in enumerate(articles):
+        first_index.setdefault((article.title, article.author), index)
+    rows = [articles[index].model_dump() for index in first_index.values()]
+
+    # Multi-row INSERT ... ON CONFLICT DO NOTHING RETURNING, existing pairs come back empty.
+    # Only the server-generated and normalized columns are sent back, bodies are known.
+    result = await db.execute(
+        insert(Article)
+        .on_conflict_do_nothing(index_elements=[Article.title, Article.author])
+        .returning(Article.id, Article.title, Article.author, Article.published_at, Article.created_at),
+        rows,
+    )
+    inserted = {(row.title, row.author): row for row in result.all()}
+    await db.commit()
+
+    items = []
+    cached_articles = {}
+    for index, article in enumerate(articles):
+        key = (article.title, article.author)
+        row = inserted.get(key)
+        if row is not None and first_index[key] == index:
+            article_schema = ArticleResponse(
+                **article.model_dump(exclude={"published_at"}),
+                id=row.id,
+                published_at=row.published_at,
+                created_at=row.created_at,
+            )
+            items.append(BulkCreateItem(index=index, status=BulkItemStatus.created, id=row.id))
+            cached_articles[row.id] = article_schema.model_dump_json()
+        else:
+            items.append(BulkCreateItem(index=index, status=BulkItemStatus.duplicate))
+
+    # Prime the cache for every new article in one pipelined round trip
+    await cache_service.set_many_cache("article", cached_articles, expire=ARTICLE_CACHE_TTL)
+    if cached_articles:
+        await _bump_generation()
+    logger.info("Bulk created %s of %s articles", len(cached_articles), len(articles))
+
+    return BulkCreateResult(
+        created=len(cached_articles),
+        duplicates=len(articles) - len(cached_articles),
+        items=items,
+    )
+
+
+async def get_articles(
+        db: AsyncSession,
+        page: int,
+        page_size: int,
+        title: Optional[str] = None,
+        author: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        content: Optional[str] = None,
+        cursor: Optional[str] = None,
+        author_match: AuthorMatch = AuthorMatch.contains,
+        estimate: bool = False,
+        fields: Optional[str] = None
+    ) -> PaginatedArticles:
+    selected_fields = _parse_fields(fields)
+
+    generation = await cache_service.get_generation("articles")
+    if generation is not None:
+        cache_key = cache_service.query_key(
+            generation,
+            page=page,
+            page_size=page_size,
+            title=title,
+            author=author,
+            author_match=author_match,
+            tags=sorted(set(tags)) if tags else None,
+            content=content,
+            cursor=cursor,
+            estimate=estimate,
+            fields=selected_fields,
+        )
+        # A client that has just written reads the primary, skip pages that may predate its write
+        if not db.info.get("read_primary"):
+            cache_result = await cache_service.get_cache("articles:list", cache_key)
+            if cache_result.get("success"):
+                return PaginatedArticles.model_validate_json(cache_result["value"])
+
+    query = _filter_articles(select(Article), title, author, author_match, tags, content)
+    query = _project(query, selected_fields)
+
+    # Planner statistics stand in for COUNT(*) on unfiltered listings when asked to
+    estimated_total = None
+    if estimate and query.whereclause is None:
+        estimated_total = await _estimate_article_count(db)
+
+    articles, next_cursor, total_articles = await _fetch_page(
+        db, query, page, page_size, cursor, count=estimated_total is None
+    )
+
+    paginated_articles = PaginatedArticles(
+        total=total_articles if estimated_total is None else estimated_total,
+        total_estimated=estimated_total is not None,
         page=page,
         page_size=page_size,
-        articles=[ArticleResponse.from_orm(article) for article in articles]
+        next_cursor=next_cursor,
+        articles=[_to_list_item(article, selected_fields) for article in articles]
     )
 
+    if generation is not None and await _may_cache_page(db):
+        await cache_service.set_cache(
+            "articles:list",
+            cache_key,
+            paginated_articles.model_dump_json(exclude_unset=True),
+            expire=LIST_CACHE_TTL,
+        )
 
-async def get_article(db: Session, article_id: int) -> ArticleResponse:
-    logging.info(f"Attempting to retrieve article with ID: {article_id} from cache...")
-    cache_result = await cache_service.get_cache("article", article_id)
-    if cache_result.get("success"):
-        return ArticleResponse.model_validate_json(cache_result["value"])
-    
-    article = db.query(Article).filter(Article.id == article_id).first()
+    return paginated_articles
+
+
+async def _bump_generation() -> None:
+    await cache_service.bump_generation("articles", settle_seconds=GENERATION_SETTLE_SECONDS)
+
+
+async def _may_cache_page(db: AsyncSession) -> bool:
+    # Primary reads are current. A replica read right after a write may not be,
+    # yet it would be cached under the generation that write bumped.
+    if not db.info.get("replica"):
+        return True
+    return not await cache_service.generation_settling("articles")
+
+
+def _raise_article_not_found(article_id: int) -> NoReturn:
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Article '{article_id}' not found.",
+    )
+
+
+class CachedArticle:
+    """An article as held in process: the payload cached in Redis, parsed on first use.
+
+    The ETag and Last-Modified validators and the gzipped body are derived once per
+    entry, so requests answered from the local cache skip serialization and compression.
+    """
+
+    __slots__ = ("_json", "_gzip", "_schema", "_etag")
+
+    def __init__(
+            self,
+            json: Optional[str] = None,
+            schema: Optional[ArticleResponse] = None,
+            gzip: Optional[bytes] = None
+        ):
+        self._json = json
+        self._gzip = gzip
+        self._schema = schema
+        self._etag = None
+
+    @classmethod
+    def from_cache(cls, value: bytes) -> "CachedArticle":
+        if value.startswith(cache_service.GZIP_MAGIC):
+            return cls(gzip=value)
+        return cls(value.decode('utf-8'))
+
+    @property
+    def json(self) -> str:
+        if self._json is None:
+            self._json = cache_service.decode_value(self._gzip)
+        return self._json
+
+    @property
+    def gzip(self) -> bytes:
+        if self._gzip is None:
+            self._gzip = cache_service.compress(self._json)
+        return self._gzip
+
+    def worth_compressing(self, minimum_size: int) -> bool:
+        # A payload that came gzipped from Redis already cleared the cache's threshold
+        return self._gzip is not None or len(self._json) >= minimum_size
+
+    @property
+    def cache_value(self) -> Union[str, bytes]:
+        """What Redis holds for this article, the gzipped body when compression applies."""
+        if cache_service.should_compress(self.json):
+            return self.gzip
+        return self.json
+
+    @property
+    def schema(self) -> ArticleResponse:
+        if self._schema is None:
+            self._schema = ArticleResponse.model_validate_json(self.json)
+        return self._schema
+
+    @property
+    def etag(self) -> str:
+        if self._etag is None:
+            self._etag = make_etag(self.json)
+        return self._etag
+
+    @property
+    def last_modified(self) -> datetime:
+        return self.schema.updated_at or self.schema.created_at
+
+
+async def _load_article(db: AsyncSession, article_id: int) -> CachedArticle:
+    global _article_load_seconds
+    started = time.perf_counter()
+
+    article = await db.get(Article, article_id)
     if not article:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Article '{article_id}' not found.",
-        )
+        # Remember the miss so repeated lookups stop at Redis
+        await cache_service.set_tombstone("article", article_id)
+        _raise_article_not_found(article_id)
     article_schema = ArticleResponse.from_orm(article)
-    
+    cached_article = CachedArticle(article_schema.model_dump_json(), article_schema)
+
     # Set cache for the retrieved article
-    logging.info(f"Caching article with ID: {article_id}")
-    await cache_service.set_cache("article", article_id, article_schema.model_dump_json())
+    logger.info("Caching article with ID: %s", article_id)
+    await cache_service.set_cache("article", article_id, cached_article.cache_value, expire=ARTICLE_CACHE_TTL)
+    cache_service.set_local("article", article_id, cached_article)
 
-    return article_schema
+    _article_load_seconds = 0.8 * _article_load_seconds + 0.2 * (time.perf_counter() - started)
+    return cached_article
+
+
+async def _load_article_once(db: AsyncSession, article_id: int) -> CachedArticle:
+    """Load an article under the cross-worker lock so one worker hits Postgres per key."""
+    token = await cache_service.acquire_lock("article", article_id)
+    if token is None:
+        # Another worker is loading it, give it a chance to fill the cache
+        cache_result = await cache_service.wait_for_cache("article", article_id, decode=False)
+        if cache_result.get("missing"):
+            _raise_article_not_found(article_id)
+        if cache_result.get("success"):
+            cached_article = CachedArticle.from_cache(cache_result["value"])
+            cache_service.set_local("article", article_id, cached_article)
+            return cached_article
+        return await _load_article(db, article_id)
+
+    try:
+        return await _load_article(db, article_id)
+    finally:
+        await cache_service.release_lock("article", article_id, token)
+
+
+async def _refresh_article(article_id: int) -> CachedArticle:
+    # Runs after the request that triggered it has released its session
+    async with read_sessionmaker()() as db:
+        return await _load_article_once(db, article_id)
+
+
+def _refresh_done(task: asyncio.Task) -> None:
+    _refresh_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Early refresh failed: %s", task.exception())
+
+
+def _schedule_refresh(article_id: int) -> None:
+    task = asyncio.create_task(
+        cache_service.single_flight("article", article_id, lambda: _refresh_article(article_id))
+    )
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_done)
+
+
+async def export_articles(
+        db: AsyncSession,
+        export_format: ExportFormat,
+        title: Optional[str] = None,
+        author: Optional[str] = None,
+        author_match: AuthorMatch = AuthorMatch.contains,
+        tags: Optional[List[str]] = None,
+        content: Optional[str] = None
+    ) -> AsyncIterator[str]:
+    """Stream every matching article as NDJSON lines or CSV rows.
+
+    Rows come from a server-side cursor EXPORT_BATCH_SIZE at a time and each
+    batch is written out before the next is fetched, so memory stays flat
+    whatever the table size. The session must stay open until the response
+    has been sent.
+    """
+    query = _filter_articles(select(Article), title, author, author_match, tags, content)
+    query = query.order_by(Article.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+    if export_format == ExportFormat.csv:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_CSV_COLUMNS)
+        yield buffer.getvalue()
+
+    result = await db.stream_scalars(query)
+    async for articles in result.partitions():
+        if export_format == ExportFormat.csv:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for article in articles:
+                writer.writerow([
+                    article.id,
+                    article.title,
+                    article.author,
+                    json.dumps(article.tags or []),
+                    article.published_at.isoformat() if article.published_at else "",
+                    article.created_at.isoformat() if article.created_at else "",
+                    article.updated_at.isoformat() if article.updated_at else "",
+                    article.body,
+                ])
+            yield buffer.getvalue()
+        else:
+            yield "".join(
+                ArticleResponse.from_orm(article).model_dump_json() + "\n" for article in articles
+            )
+        # Drop the batch from the identity map before fetching the next one
+        db.expunge_all()
+
+
+async def get_cached_article(db: AsyncSession, article_id: int) -> CachedArticle:
+    local_article = cache_service.get_local("article", article_id)
+    if local_article is not None:
+        return local_article
 
+    logger.info("Attempting to retrieve article with ID: %s from cache...", article_id)
+    cache_result = await cache_service.get_cache("article", article_id, with_ttl=True, decode=False)
+    if cache_result.get("missing"):
+        _raise_article_not_found(article_id)
+    if cache_result.get("success"):
+        cached_article = CachedArticle.from_cache(cache_result["value"])
+        cache_service.set_local("article", article_id, cached_article)
+        ttl = cache_result.get("ttl")
+        if ttl is not None and cache_service.should_refresh_early(ttl, _article_load_seconds):
+            _schedule_refresh(article_id)
+        return cached_article
+
+    # Concurrent misses in this process share a single load
+    return await cache_service.single_flight(
+        "article", article_id, lambda: _load_article_once(db, article_id)
+    )
+
+
+async def get_article(db: AsyncSession, article_id: int) -> ArticleResponse:
+    cached_article = await get_cached_article(db, article_id)
+    return cached_article.schema
+
+
+async def get_articles_by_ids(db: AsyncSession, article_ids: List[int]) -> ArticleBatch:
+    article_ids = list(dict.fromkeys(article_ids))
+    found = {}
+
+    for article_id in article_ids:
+        local_article = cache_service.get_local("article", article_id)
+        if local_article is not None:
+            found[article_id] = local_article.schema
+
+    # One MGET for everything not held in process
+    remaining = [article_id for article_id in article_ids if article_id not in found]
+    cache_result = await cache_service.get_many_cache("article", remaining)
+    for article_id, value in cache_result["values"].items():
+        cached_article = CachedArticle(value)
+        cache_service.set_local("article", article_id, cached_article)
+        found[article_id] = cached_article.schema
+    missing = set(cache_result["missing"])
+
+    # One IN query for the misses, backfilled with one pipeline
+    misses = [article_id for article_id in remaining if article_id not in found and article_id not in missing]
+    if misses:
+        result = await db.execute(select(Article).filter(Article.id.in_(misses)))
+        loaded = {}
+        for article in result.scalars().all():
+            article_schema = ArticleResponse.from_orm(article)
+            cached_article = CachedArticle(article_schema.model_dump_json(), article_schema)
+            cache_service.set_local("article", article.id, cached_article)
+            found[article.id] = article_schema
+            loaded[article.id] = cached_article.cache_value
+        not_found = [article_id for article_id in misses if article_id not in loaded]
+        missing.update(not_found)
+        await cache_service.set_many_cache("article", loaded, expire=ARTICLE_CACHE_TTL, missing=not_found)
+
+    return ArticleBatch(
+        articles=[found[article_id] for article_id in article_ids if article_id in found],
+        missing=[article_id for article_id in article_ids if article_id in missing],
+    )
+
+
+async def _raise_duplicate_update(db: AsyncSession, article_id: int, update_data: dict) -> NoReturn:
+    # Only reached on a rejected update, the current row fills in whichever field was not sent
+    article = await db.get(Article, article_id)
+    title = update_data.get("title", getattr(article, "title", None))
+    author = update_data.get("author", getattr(article, "author", None))
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Article with title '{title}' by author '{author}' already exists.",
+    )
+
+
+async def update_article(db: AsyncSession, article_id: int, article_data: ArticleUpdate) -> ArticleResponse:
+    update_data = article_data.dict(exclude_unset=True)
+    if update_data:
+        try:
+            # UPDATE ... RETURNING, the unique (title, author) index rejects duplicates
+            article = await db.scalar(
+                update(Article).where(Article.id == article_id).values(**update_data).returning(Article)
+            )
+        except IntegrityError as error:
+            await db.rollback()
+            if UNIQUE_TITLE_AUTHOR not in str(error.orig):
+                raise
+            await _raise_duplicate_update(db, article_id, update_data)
+    else:
+        article = await db.get(Article, article_id)
 
-async def update_article(db: Session, article_id: int, article_data: ArticleUpdate) -> ArticleResponse:
-    article = db.query(Article).filter(Article.id == article_id).first()
     if not article:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Article '{article_id}' not found.",
         )
-    
-    update_data = article_data.dict(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(article, key, value)
 
-    existing_author_article = db.query(Article).filter(Article.author==article.author, Article.title==article.title).first()
-    if existing_author_article and existing_author_article.id != article.id:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Article with title '{article.title}' by author '{article.author}' already exists.",
-        )
-
-    db.commit()
-    db.refresh(article)
+    article_schema = ArticleResponse.from_orm(article)
+    await db.commit()
 
-    # Invalidate cache for the updated article
-    await cache_service.delete_cache("article", article_id)
-    logging.info(f"Article updated with ID: {article_id}")
+    # Write the new version through, a miss now could read a lagging replica
+    await cache_service.set_cache(
+        "article", article_id, CachedArticle(article_schema.model_dump_json(), article_schema).cache_value,
+        expire=ARTICLE_CACHE_TTL,
+    )
+    await cache_service.publish_invalidation("article", article_id)
+    await _bump_generation()
+    logger.info("Article updated with ID: %s", article_id)
 
-    return article
+    return article_schema
 
 
-async def delete_article(db: Session, article_id: int) -> None:
-    article = db.query(Article).filter(Article.id == article_id).first()
+async def delete_article(db: AsyncSession, article_id: int) -> None:
+    article = await db.get(Article, article_id)
     if not article:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Article '{article_id}' not found.",
         )
-    
-    db.delete(article)
-    db.commit()
 
-    # Invalidate cache for the deleted article
-    await cache_service.delete_cache("article", article_id)
-    logging.info(f"Article deleted with ID: {article_id}")
+    await db.delete(article)
+    await db.commit()
+
+    # Replace the cached article with a tombstone so lookups 404 from Redis
+    await cache_service.set_tombstone("article", article_id)
+    await cache_service.publish_invalidation("article", article_id)
+    await _bump_generation()
+    logger.info("Article deleted with ID: %s", article_id)
 
 
-def search_articles(
-        db: Session,
+async def search_articles(
+        db: AsyncSession,
         q: str,
         page: int,
-        page_size: int
+        page_size: int,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None
     ) -> PaginatedArticles:
-    query = db.query(Article).filter(
-        (Article.title.ilike(f"%{q}%")) |
-        (Article.body.ilike(f"%{q}%"))
-    )
+    selected_fields = _parse_fields(fields)
 
-    offset = (page - 1) * page_size
+    generation = await cache_service.get_generation("articles")
+    if generation is not None:
+        cache_key = cache_service.query_key(
+            generation, q=q, page=page, page_size=page_size, cursor=cursor, fields=selected_fields
+        )
+        if not db.info.get("read_primary"):
+            cache_result = await cache_service.get_cache("articles:search", cache_key)
+            if cache_result.get("success"):
+                return PaginatedArticles.model_validate_json(cache_result["value"])
+
+    ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    match = Article.search_vector.op("@@")(ts_query)
+    rank = func.ts_rank(Article.search_vector, ts_query)
+
+    count_query = select(func.count()).select_from(Article).filter(match)
 
-    articles = (
-        query
-        .order_by(Article.published_at.desc())
-        .offset(offset)
-        .limit(page_size)
-        .all()
+    # Most relevant first, (rank, id) doubles as the keyset for cursor pages
+    query = (
+        select(Article, rank, count_query.correlate(None).scalar_subquery())
+        .filter(match)
+        .order_by(rank.desc(), Article.id.desc())
     )
+    query = _project(query, selected_fields)
+    if cursor is None:
+        query = query.offset((page - 1) * page_size)
+    else:
+        cursor_rank, cursor_id = decode_cursor(cursor, float, int)
+        query = query.filter(tuple_(rank, Article.id) < (cursor_rank, cursor_id))
+
+    result = await db.execute(query.limit(page_size + 1))
+    rows = result.all()
+
+    if rows:
+        total_articles = rows[0][2]
+    else:
+        total_articles = await db.scalar(count_query)
 
-    total_articles = query.count()
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last_article, last_rank, _ = rows[-1]
+        next_cursor = encode_cursor(last_rank, last_article.id)
 
-    return PaginatedArticles(
+    paginated_articles = PaginatedArticles(
         total=total_articles,
+        total_estimated=False,
         page=page,
         page_size=page_size,
-        articles=[ArticleResponse.from_orm(article) for article in articles]
-    )
\ No newline at end of file
+        next_cursor=next_cursor,
+        articles=[_to_list_item(article, selected_fields) for article, _, _ in rows]
+    )
+
+    if generation is not None and await _may_cache_page(db):
+        await cache_service.set_cache(
+            "articles:search",
+            cache_key,
+            paginated_articles.model_dump_json(exclude_unset=True),
+            expire=LIST_CACHE_TTL,
+        )
+
+    return paginated_articles
@@ -1,6 +1,22 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Optional, Union
 from datetime import datetime
+from enum import StrEnum
+
+
+BULK_CREATE_MAX_ITEMS = 5000
+BATCH_GET_MAX_IDS = 100
+
+
+class AuthorMatch(StrEnum):
+    contains = "contains"
+    prefix = "prefix"
+    exact = "exact"
+
+
+class ExportFormat(StrEnum):
+    ndjson = "ndjson"
+    csv = "csv"
 
 
 class ArticleBase(BaseModel):
@@ -15,6 +31,10 @@ class ArticleCreate(ArticleBase):
     pass
 
 
+class ArticleBulkCreate(BaseModel):
+    articles: List[ArticleCreate] = Field(..., min_length=1, max_length=BULK_CREATE_MAX_ITEMS)
+
+
 class ArticleUpdate(ArticleBase):
     title: Optional[str] = None
     author: Optional[str] = None
@@ -33,8 +53,48 @@ class ArticleResponse(ArticleBase):
         from_attributes = True
 
 
+# Columns a list or search request may pick with fields=, id is always returned
+ARTICLE_FIELDS = ("title", "author", "tags", "published_at", "created_at", "updated_at", "body")
+
+
+class ArticleSummary(BaseModel):
+    """Sparse article holding only the requested fields."""
+    id: int
+    title: Optional[str] = None
+    author: Optional[str] = None
+    tags: Optional[List[str]] = None
+    published_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    body: Optional[str] = None
+
+
 class PaginatedArticles(BaseModel):
     total: int
+    total_estimated: bool = False
     page: int
     page_size: int
-    articles: List[ArticleResponse]
\ No newline at end of file
+    next_cursor: Optional[str] = None
+    articles: List[Union[ArticleResponse, ArticleSummary]]
+
+
+class ArticleBatch(BaseModel):
+    articles: List[ArticleResponse]
+    missing: List[int] = []
+
+
+class BulkItemStatus(StrEnum):
+    created = "created"
+    duplicate = "duplicate"
+
+
+class BulkCreateItem(BaseModel):
+    index: int
+    status: BulkItemStatus
+    id: Optional[int] = None
+
+
+class BulkCreateResult(BaseModel):
+    created: int
+    duplicates: int
+    items: List[BulkCreateItem]
@@ -1,111 +1,212 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, Query, status, Request
-from sqlalchemy.orm import Session
-from app.config.database import get_db
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config.database import get_async_read_db, get_async_write_db
 from app.articles.controller import (
+    bulk_create_articles,
     create_article, 
     get_articles, 
-    get_article,
+    get_cached_article,
+    get_articles_by_ids,
     search_articles, 
     update_article, 
-    delete_article
+    delete_article,
+    export_articles
 )
 from app.articles.schema import (
+    BATCH_GET_MAX_IDS,
+    ArticleBatch,
+    ArticleBulkCreate,
     ArticleCreate, 
+    AuthorMatch,
+    BulkCreateResult,
+    ExportFormat,
     ArticleResponse, 
     PaginatedArticles, 
     ArticleUpdate
 )
 from app.utils.auth_utils import get_api_key
+from app.utils.http_utils import COMPRESSION_MIN_SIZE, accepts_gzip, conditional_response
 from ..rate_limiting import limiter
 
 
 router = APIRouter(prefix="/articles", tags=["Articles"])
 
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
 
-@router.post("/", response_model=ArticleResponse, status_code=status.HTTP_201_CREATED)
-@limiter.limit("5/minute") 
+
+@router.post(
+    "/", response_model=ArticleResponse, status_code=status.HTTP_201_CREATED,
+    dependencies=[limiter.limit("5/minute")],
+)
 async def create_article_view(
     request: Request,
     article: ArticleCreate, 
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_write_db),
     api_key: str = Depends(get_api_key),
 ):
     return await create_article(db, article)
 
 
-@router.get("/", response_model=PaginatedArticles)
-@limiter.limit("20/minute")
-def get_articles_view(
+@router.post("/bulk", response_model=BulkCreateResult, dependencies=[limiter.limit("5/minute")])
+async def bulk_create_articles_view(
+    request: Request,
+    payload: ArticleBulkCreate,
+    db: AsyncSession = Depends(get_async_write_db),
+    api_key: str = Depends(get_api_key),
+):
+    return await bulk_create_articles(db, payload.articles)
+
+
+# Unset fields are left out so sparse fieldsets only carry what was asked for
+@router.get(
+    "/", response_model=PaginatedArticles, response_model_exclude_unset=True,
+    dependencies=[limiter.limit("20/minute")],
+)
+async def get_articles_view(
     request: Request,
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_async_read_db), 
     page: int = 1, 
     page_size: int = 10,
     title: Optional[str] = None,
     author: Optional[str] = None,
     tags: Optional[List[str]] = Query(None),
     content: Optional[str] = None,
+    cursor: Optional[str] = None,
+    author_match: AuthorMatch = AuthorMatch.contains,
+    estimate: bool = False,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. title,author,tags"),
     api_key: str = Depends(get_api_key)
 ):
-    return get_articles(
+    paginated_articles = await get_articles(
         db, 
         page=page, 
         page_size=page_size, 
         title=title, 
         author=author, 
         tags=tags, 
-        content=content
+        content=content,
+        cursor=cursor,
+        author_match=author_match,
+        estimate=estimate,
+        fields=fields
+    )
+    return conditional_response(request, paginated_articles.model_dump_json(exclude_unset=True))
+
+
+# /export and /batch are registered ahead of /{article_id} so they are not read as ids
+@router.get("/export", response_class=StreamingResponse, dependencies=[limiter.limit("5/minute")])
+async def export_articles_view(
+    request: Request,
+    format: ExportFormat = ExportFormat.ndjson,
+    title: Optional[str] = None,
+    author: Optional[str] = None,
+    author_match: AuthorMatch = AuthorMatch.contains,
+    tags: Optional[List[str]] = Query(None),
+    content: Optional[str] = None,
+    # Request scope keeps the session open while the response streams
+    db: AsyncSession = Depends(get_async_read_db, scope="request"),
+    api_key: str = Depends(get_api_key)
+):
+    return StreamingResponse(
+        export_articles(
+            db,
+            format,
+            title=title,
+            author=author,
+            author_match=author_match,
+            tags=tags,
+            content=content
+        ),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="articles.{format}"'},
     )
 
 
-@router.get("/{article_id}", response_model=ArticleResponse)
-@limiter.limit("20/minute")
+@router.get("/batch", response_model=ArticleBatch, dependencies=[limiter.limit("20/minute")])
+async def get_articles_by_ids_view(
+    request: Request,
+    ids: List[int] = Query(..., min_length=1, max_length=BATCH_GET_MAX_IDS),
+    db: AsyncSession = Depends(get_async_read_db),
+    api_key: str = Depends(get_api_key)
+):
+    return await get_articles_by_ids(db, ids)
+
+
+@router.get(
+    "/{article_id}", response_model=ArticleResponse,
+    dependencies=[limiter.limit("20/minute")],
+)
 async def get_article_view(
     request: Request,
     article_id: int, 
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     api_key: str = Depends(get_api_key)
 ):
-    return await get_article(db, article_id)
+    # Cached JSON, or its cached gzip, goes out as is, validators come from the cached entry
+    cached_article = await get_cached_article(db, article_id)
+    if accepts_gzip(request) and cached_article.worth_compressing(COMPRESSION_MIN_SIZE):
+        return conditional_response(
+            request,
+            cached_article.gzip,
+            cached_article.etag,
+            cached_article.last_modified,
+            content_encoding="gzip",
+        )
+    return conditional_response(
+        request, cached_article.json, cached_article.etag, cached_article.last_modified
+    )
 
 
-@router.put("/{article_id}", response_model=ArticleResponse)
-@limiter.limit("10/minute")
+@router.put(
+    "/{article_id}", response_model=ArticleResponse,
+    dependencies=[limiter.limit("10/minute")],
+)
 async def update_article_view(
     request: Request,
     article_id: int, 
     article: ArticleUpdate, 
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_write_db),
     api_key: str = Depends(get_api_key)
 ):
     return await update_article(db, article_id, article)
 
 
-@router.delete("/{article_id}", status_code=204)
-@limiter.limit("10/minute")
+@router.delete("/{article_id}", status_code=204, dependencies=[limiter.limit("10/minute")])
 async def delete_article_view(
     request: Request,
     article_id: int, 
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_write_db),
     api_key: str = Depends(get_api_key)
 ):
     await delete_article(db, article_id)
     return {"detail": "Article deleted successfully."}
 
 
-@router.get("/search/", response_model=PaginatedArticles)
-@limiter.limit("50/minute")
+@router.get(
+    "/search/", response_model=PaginatedArticles, response_model_exclude_unset=True,
+    dependencies=[limiter.limit("50/minute")],
+)
 async def search_articles_view(
     request: Request,
     q: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     page: int = 1,
     page_size: int = 10,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. title,author,tags"),
     api_key: str = Depends(get_api_key)
 ):
-    return search_articles(
+    paginated_articles = await search_articles(
         db,
         q,
         page=page,
-        page_size=page_size
-    )
\ No newline at end of file
+        page_size=page_size,
+        cursor=cursor,
+        fields=fields
+    )
+    return conditional_response(request, paginated_articles.model_dump_json(exclude_unset=True))
\ No newline at end of file
@@ -1,15 +1,107 @@
+from fastapi import Depends, Request, Response
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
 from dotenv import load_dotenv
+from typing import List
+import itertools
 import os
+import time
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+ASYNC_DATABASE_URL = make_url(DATABASE_URL).set(drivername="postgresql+asyncpg")
+# Comma-separated read replicas, read-only endpoints are spread over them
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+# After a write the client reads from the primary this long, so it sees its own
+# changes despite replication lag; 0 turns it off
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", 5))
+READ_PRIMARY_COOKIE = "read_primary"
+# Session.info flags: "replica" on replica sessions, "read_primary" on primary
+# sessions serving a read for a client that has just written
 
-engine = create_engine(DATABASE_URL, echo=True)
+# Each worker process opens up to DB_POOL_SIZE + DB_MAX_OVERFLOW connections
+# per engine, keep workers * engines * that below Postgres max_connections
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+
+class _TimedPoolMixin:
+    """Records how long checkouts wait for a connection, opening a new one included,
+    and how many time out."""
+
+    checkouts = 0
+    timeouts = 0
+    wait_seconds_total = 0.0
+    wait_seconds_max = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+ENGINE_OPTIONS = {
+    "echo": DB_ECHO,
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+    "pool_recycle": DB_POOL_RECYCLE,
+    "pool_pre_ping": DB_POOL_PRE_PING,
+}
+
+engine = create_engine(DATABASE_URL, poolclass=TimedQueuePool, **ENGINE_OPTIONS)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine used by the request handlers so DB I/O yields to the event loop
+async_engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=TimedAsyncAdaptedQueuePool, **ENGINE_OPTIONS)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+replica_engines = [
+    create_async_engine(
+        make_url(url).set(drivername="postgresql+asyncpg"),
+        poolclass=TimedAsyncAdaptedQueuePool,
+        **ENGINE_OPTIONS,
+    )
+    for url in DATABASE_REPLICA_URLS
+]
+ReplicaSessionLocals: List[async_sessionmaker] = [
+    async_sessionmaker(
+        bind=replica_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False, info={"replica": True}
+    )
+    for replica_engine in replica_engines
+]
+_replica_round_robin = itertools.cycle(ReplicaSessionLocals)
+
 Base = declarative_base()
 
 def get_db():
@@ -17,4 +109,53 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def read_sessionmaker() -> async_sessionmaker:
+    """Next replica in turn, the primary when none are configured."""
+    if not ReplicaSessionLocals:
+        return AsyncSessionLocal
+    return next(_replica_round_robin)
+
+
+async def get_async_read_db(request: Request, db: AsyncSession = Depends(get_async_db)):
+    # The primary session only checks out a connection if it is used
+    if not ReplicaSessionLocals:
+        yield db
+        return
+    if request.cookies.get(READ_PRIMARY_COOKIE):
+        db.info["read_primary"] = True
+        yield db
+        return
+    async with read_sessionmaker()() as replica_db:
+        yield replica_db
+
+
+async def get_async_write_db(response: Response, db: AsyncSession = Depends(get_async_db)):
+    if ReplicaSessionLocals and REPLICA_STICKY_SECONDS > 0:
+        response.set_cookie(READ_PRIMARY_COOKIE, "1", max_age=REPLICA_STICKY_SECONDS, httponly=True)
+    yield db
+
+
+def pool_stats(pool: Pool) -> dict:
+    stats = {
+        "size": pool.size(),
+        "max_overflow": DB_MAX_OVERFLOW,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+    if isinstance(pool, _TimedPoolMixin):
+        stats.update(
+            checkouts=pool.checkouts,
+            timeouts=pool.timeouts,
+            wait_seconds_avg=pool.wait_seconds_total / pool.checkouts if pool.checkouts else 0.0,
+            wait_seconds_max=pool.wait_seconds_max,
+        )
+    return stats
@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text
 import redis
 
-from app.config.database import get_db
+from app.config.database import async_engine, engine, get_db, pool_stats, replica_engines
 from app.config.redis import get_redis_client
 from app.utils.auth_utils import get_api_key
 
@@ -26,4 +26,14 @@ def check_redis(redis_client: redis.Redis = Depends(get_redis_client), api_key:
         redis_client.ping()
         return {"status": "ok"}
     except Exception as e:
-        return {"status": "error", "detail": str(e)}
\ No newline at end of file
+        return {"status": "error", "detail": str(e)}
+
+
+@router.get("/pool", summary="Connection pool statistics for this worker")
+def check_pool(api_key: str = Depends(get_api_key)):
+    # overflow goes negative while the pool has not opened all of pool_size yet
+    return {
+        "sync": pool_stats(engine.pool),
+        "async": pool_stats(async_engine.pool),
+        "replicas": [pool_stats(replica_engine.pool) for replica_engine in replica_engines],
+    }
@@ -1,9 +1,28 @@
+import atexit
+import json
 import logging
+import os
+import queue
+import random
+from datetime import datetime, timezone
 from enum import StrEnum
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
 
 
 LOG_FORMAT_DEBUG = "%(levelname)s:%(message)s:%(pathname)s:%(funcName)s:%(lineno)d"
 
+# json or text
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+# Fraction of records below WARNING kept per logger, e.g.
+# "app.services.cache_service=0.01,app.articles.controller=0.1"
+LOG_SAMPLING = os.getenv("LOG_SAMPLING", "app.services.cache_service=0.01")
+
+# Attributes every LogRecord has, anything else was passed through extra=
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[QueueListener] = None
+
 
 class LogLevels(StrEnum):
     info = "INFO"
@@ -12,16 +31,105 @@ class LogLevels(StrEnum):
     debug = "DEBUG"
 
 
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, extra= fields included as keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.levelno <= logging.DEBUG:
+            entry.update(pathname=record.pathname, funcName=record.funcName, lineno=record.lineno)
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a fraction of a logger's records below WARNING, warnings and errors always pass."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
+
+class _LazyQueueHandler(QueueHandler):
+    # The stock prepare() renders the message in the calling thread, leave that to
+    # the listener. Only a traceback has to be rendered here, while its frames exist.
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _parse_sampling(value: str) -> "dict[str, float]":
+    rates = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, rate = item.partition("=")
+        try:
+            rates[name.strip()] = float(rate)
+        except ValueError:
+            continue
+    return rates
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
+
+
 def configure_logging(log_level: str = LogLevels.info) -> None:
+    """Route every record through a queue so callers never block on stream I/O.
+
+    A background listener thread formats and writes them.
+    """
+    global _listener
     log_level = str(log_level).upper()
     log_levels = [level.value for level in LogLevels]
-
     if log_level not in log_levels:
-        logging.basicConfig(level=LogLevels.error)
-        return
-    
-    if log_level == LogLevels.debug:
-        logging.basicConfig(level=log_level, format=LOG_FORMAT_DEBUG)
-        return
-    
-    logging.basicConfig(level=log_level)
\ No newline at end of file
+        log_level = LogLevels.error
+
+    if LOG_FORMAT == "json":
+        formatter = JsonFormatter()
+    elif log_level == LogLevels.debug:
+        formatter = logging.Formatter(LOG_FORMAT_DEBUG)
+    else:
+        formatter = logging.Formatter(logging.BASIC_FORMAT)
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+
+    stop_logging()
+    log_queue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+    root = logging.getLogger()
+    for handler in [handler for handler in root.handlers if isinstance(handler, QueueHandler)]:
+        root.removeHandler(handler)
+    root.addHandler(_LazyQueueHandler(log_queue))
+    root.setLevel(log_level)
+
+    for name, rate in _parse_sampling(LOG_SAMPLING).items():
+        logger = logging.getLogger(name)
+        for existing in [f for f in logger.filters if isinstance(f, SamplingFilter)]:
+            logger.removeFilter(existing)
+        logger.addFilter(SamplingFilter(rate))
@@ -1,29 +1,62 @@
 from fastapi import FastAPI
 from app.articles import view
-from app import health
+from app import health, metrics, profiling
+from app.config.database import async_engine, engine, replica_engines
+from app.rate_limiting import RateLimitExceeded, rate_limit_exceeded_handler
+from app.services import cache_service
+from app.utils.http_utils import COMPRESSION_MIN_SIZE, NegotiatingGZipMiddleware
 from .logging import configure_logging, LogLevels
 import logging
 
 
 configure_logging(LogLevels.info)
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Article Management API", version="1.0.0")
 
+app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
+
+# Middleware added later wraps the ones before it
+app.add_middleware(profiling.SQLProfilingMiddleware)
+profiling.profile_engine(engine)
+profiling.profile_engine(async_engine.sync_engine)
+for replica_engine in replica_engines:
+    profiling.profile_engine(replica_engine.sync_engine)
+
+# Brotli when brotli-asgi is installed, it falls back to gzip for clients
+# without br support. Responses already carrying a Content-Encoding, like
+# precompressed cached articles, pass through untouched.
+try:
+    from brotli_asgi import BrotliMiddleware
+    app.add_middleware(BrotliMiddleware, minimum_size=COMPRESSION_MIN_SIZE, gzip_fallback=True)
+except ImportError:
+    app.add_middleware(NegotiatingGZipMiddleware, minimum_size=COMPRESSION_MIN_SIZE, compresslevel=6)
+
+# Outermost, so the recorded latency includes compression
+app.add_middleware(metrics.MetricsMiddleware)
+metrics.instrument_engine(engine)
+metrics.instrument_engine(async_engine.sync_engine)
+for replica_engine in replica_engines:
+    metrics.instrument_engine(replica_engine.sync_engine)
+
 app.include_router(view.router)
 app.include_router(health.router)
+app.include_router(metrics.router)
 
 @app.on_event("startup")
 async def startup_event():
     from app.config.redis import redis_client
     try:
         await redis_client.ping()
-        logging.info("Connected to Redis")
+        logger.info("Connected to Redis")
     except Exception as e:
-        logging.error(f"Failed to connect to Redis: {e}")
+        logger.error("Failed to connect to Redis: %s", e)
+    cache_service.start_invalidation_listener()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     from app.config.redis import redis_client
+    await cache_service.stop_invalidation_listener()
     await redis_client.close()
     await redis_client.connection_pool.disconnect()
-    logging.info("Disconnected from Redis")
\ No newline at end of file
+    logger.info("Disconnected from Redis")
\ No newline at end of file
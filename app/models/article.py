@@ -1,9 +1,16 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
-from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy import Column, Computed, Integer, String, Text, DateTime, Index
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from app.config.database import Base
 
 
+# Text search configuration shared by the search_vector column and search queries
+SEARCH_CONFIG = "english"
+# Unique index behind duplicate article errors
+UNIQUE_TITLE_AUTHOR = "uq_articles_title_author"
+
+
 class Article(Base):
     __tablename__ = "articles"
 
@@ -15,3 +22,30 @@ class Article(Base):
     published_at = Column(DateTime, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Maintained by Postgres, titles weigh more than bodies when ranking
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(body, '')), 'B')",
+            persisted=True,
+        ),
+    ))
+
+    __table_args__ = (
+        # Keyset pagination order: newest first, id as tie breaker
+        Index(
+            "ix_articles_published_at_id",
+            published_at.desc().nulls_last(),
+            id.desc(),
+        ),
+        Index("ix_articles_search_vector", "search_vector", postgresql_using="gin"),
+        # Trigram indexes serve the '%...%' substring filters of get_articles
+        Index("ix_articles_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_articles_author_trgm", "author", postgresql_using="gin", postgresql_ops={"author": "gin_trgm_ops"}),
+        Index("ix_articles_body_trgm", "body", postgresql_using="gin", postgresql_ops={"body": "gin_trgm_ops"}),
+        # One article per title and author, also the ON CONFLICT target of inserts
+        Index(UNIQUE_TITLE_AUTHOR, "title", "author", unique=True),
+        # Serves LIKE 'prefix%' on author whatever the database collation
+        Index("ix_articles_author_pattern", "author", postgresql_ops={"author": "varchar_pattern_ops"}),
+    )
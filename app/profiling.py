@@ -0,0 +1,120 @@
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import logging
+import os
+import time
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+SQL_PROFILING = os.getenv("SQL_PROFILING", "true").lower() == "true"
+# Requests going over either budget are logged with their statement counts
+SQL_BUDGET_QUERIES = int(os.getenv("SQL_BUDGET_QUERIES", 10))
+SQL_BUDGET_MS = float(os.getenv("SQL_BUDGET_MS", 100))
+# The same statement this many times in one request usually means a query per row
+SQL_REPEAT_THRESHOLD = int(os.getenv("SQL_REPEAT_THRESHOLD", 3))
+
+
+class QueryProfile:
+    """Statements a single request ran and the time they took."""
+
+    __slots__ = ("count", "seconds", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+    def repeated(self) -> "list[tuple[str, int]]":
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count >= SQL_REPEAT_THRESHOLD
+        ]
+
+
+# Set per request by the middleware; the async engine runs its events in a
+# greenlet that shares the request's context, so they see the same profile
+_current_profile: ContextVar[Optional[QueryProfile]] = ContextVar("sql_profile", default=None)
+
+
+def profile_engine(engine: Engine) -> None:
+    """Record statements on engine into the current request's profile, pass async_engine.sync_engine for async ones."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current_profile.get() is not None:
+            conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        profile = _current_profile.get()
+        if profile is not None and conn.info.get("profile_started"):
+            profile.record(statement, time.perf_counter() - conn.info["profile_started"].pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("profile_started"):
+            connection.info["profile_started"].pop()
+
+
+class SQLProfilingMiddleware:
+    """Counts and times the SQL each request runs.
+
+    Adds a Server-Timing header with the totals so far when the response starts,
+    and logs requests over budget or repeating the same statement.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not SQL_PROFILING:
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+        token = _current_profile.set(profile)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={profile.seconds * 1000:.1f};desc="{profile.count} queries"',
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_profile.reset(token)
+            self._report(scope, profile)
+
+    def _report(self, scope: Scope, profile: QueryProfile) -> None:
+        request = f"{scope['method']} {scope['path']}"
+        duration_ms = profile.seconds * 1000
+        if profile.count > SQL_BUDGET_QUERIES or duration_ms > SQL_BUDGET_MS:
+            logger.warning(
+                "SQL budget exceeded on %s: %s queries in %.1f ms", request, profile.count, duration_ms
+            )
+        for statement, count in profile.repeated():
+            logger.warning(
+                "Statement repeated %s times on %s, possible N+1: %.200s",
+                count,
+                request,
+                " ".join(statement.split()),
+            )
@@ -1,5 +1,119 @@
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from fastapi import Depends, Request
+from fastapi.responses import JSONResponse
+from limits import RateLimitItem, parse
+from limits.aio.storage import MemoryStorage
+from limits.aio.strategies import MovingWindowRateLimiter
+from limits.errors import StorageError
+from limits.storage import storage_from_string
+from redis.exceptions import RedisError
+from dotenv import load_dotenv
+import asyncio
+import logging
+import math
+import os
+import time
 
+load_dotenv()
 
-limiter = Limiter(key_func=get_remote_address)
\ No newline at end of file
+logger = logging.getLogger(__name__)
+
+# Counters live in Redis so every worker and pod enforces the same limits.
+# The moving window is a single Lua script per check, one round trip.
+RATE_LIMIT_STORAGE_URI = os.getenv(
+    "RATE_LIMIT_STORAGE_URI",
+    f"redis://{os.getenv('REDIS_HOST', 'localhost')}:{os.getenv('REDIS_PORT', 6379)}/{os.getenv('REDIS_DB', 0)}",
+)
+RATELIMIT_ENABLED = os.getenv("RATELIMIT_ENABLED", "true").lower() == "true"
+# After a storage error, per-process counters are used this long before Redis is tried again
+RATE_LIMIT_RETRY_SECONDS = float(os.getenv("RATE_LIMIT_RETRY_SECONDS", 30))
+
+# Storage failures that fall back to per-process counters. Besides wrapped
+# errors, redis-py can raise its own or the socket's, and a connection used
+# from a loop other than its own raises RuntimeError.
+STORAGE_ERRORS = (StorageError, RedisError, OSError, RuntimeError)
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, limit: RateLimitItem, retry_after: int):
+        super().__init__(str(limit))
+        self.limit = limit
+        self.retry_after = retry_after
+
+
+def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> JSONResponse:
+    return JSONResponse(
+        {"error": f"Rate limit exceeded: {exc.limit}"},
+        status_code=429,
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+class RateLimiter:
+    """Per-client, per-route limits checked through the async limits API.
+
+    The check awaits Redis instead of blocking the event loop on it.
+    """
+
+    def __init__(self, storage_uri: str, enabled: bool = True):
+        self.enabled = enabled
+        if not storage_uri.startswith("async+"):
+            storage_uri = "async+" + storage_uri
+        self._storage_uri = storage_uri
+        self._storage_options = {"wrap_exceptions": True}
+        if storage_uri.startswith(("async+redis", "async+rediss")):
+            self._storage_options.update(implementation="redispy", key_prefix="ratelimit")
+        self._loop = None
+        self._strategy = None
+        self._fallback = None
+        self._storage_down_until = 0.0
+
+    def _strategies(self) -> "tuple[MovingWindowRateLimiter, MovingWindowRateLimiter]":
+        # Async storages keep connections bound to the loop that opened them, so
+        # they are created on first use and again whenever the loop changes
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._strategy = MovingWindowRateLimiter(storage_from_string(self._storage_uri, **self._storage_options))
+            # Used while Redis is unreachable rather than failing requests
+            self._fallback = MovingWindowRateLimiter(MemoryStorage())
+            self._storage_down_until = 0.0
+            self._loop = loop
+        return self._strategy, self._fallback
+
+    async def _hit(self, limit: RateLimitItem, *identifiers: str) -> "tuple[bool, MovingWindowRateLimiter]":
+        strategy, fallback = self._strategies()
+        if time.monotonic() >= self._storage_down_until:
+            try:
+                return await strategy.hit(limit, *identifiers), strategy
+            except STORAGE_ERRORS as error:
+                logger.warning(
+                    "Rate limit storage unavailable, counting in process: %s",
+                    getattr(error, "storage_error", error),
+                )
+                self._storage_down_until = time.monotonic() + RATE_LIMIT_RETRY_SECONDS
+        return await fallback.hit(limit, *identifiers), fallback
+
+    def limit(self, limit_value: str):
+        """Dependency enforcing limit_value, e.g. dependencies=[limiter.limit("5/minute")]."""
+        limit = parse(limit_value)
+
+        async def check_rate_limit(request: Request) -> None:
+            if not self.enabled:
+                return
+            route = request.scope.get("route")
+            identifiers = (
+                request.client.host if request.client else "unknown",
+                request.method,
+                getattr(route, "path", request.url.path),
+            )
+            allowed, strategy = await self._hit(limit, *identifiers)
+            if not allowed:
+                try:
+                    reset_time = (await strategy.get_window_stats(limit, *identifiers)).reset_time
+                except STORAGE_ERRORS:
+                    reset_time = time.time() + limit.get_expiry()
+                raise RateLimitExceeded(limit, max(math.ceil(reset_time - time.time()), 1))
+
+        return Depends(check_rate_limit)
+
+
+limiter = RateLimiter(RATE_LIMIT_STORAGE_URI, enabled=RATELIMIT_ENABLED)
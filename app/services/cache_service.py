@@ -1,28 +1,114 @@
 from app.config.redis import get_redis_client
+from app.metrics import record_cache
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, Union
+import asyncio
+import gzip
+import hashlib
+import json
 import logging
+import math
+import os
+import random
+import secrets
+import time
 
 
-async def set_cache(resource: str, key: int, value: str, expire: int = 120) -> None:
+logger = logging.getLogger(__name__)
+
+# In-process tier in front of Redis. Entries hold already-validated objects
+# and are evicted across workers through Redis pub/sub; the TTL bounds
+# staleness should an invalidation message be lost.
+LOCAL_CACHE_MAX_ITEMS = int(os.getenv("LOCAL_CACHE_MAX_ITEMS", 1024))
+LOCAL_CACHE_TTL = float(os.getenv("LOCAL_CACHE_TTL", 30))
+INVALIDATION_CHANNEL = "cache:invalidations"
+
+_local_cache: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+_invalidation_listener: Optional[asyncio.Task] = None
+
+# Stored in place of a value to remember that a key has nothing behind it
+TOMBSTONE = "__tombstone__"
+TOMBSTONE_TTL = 30
+
+# Values from CACHE_COMPRESSION_MIN_SIZE characters up are stored gzipped
+# when enabled, so hits can go out as is to clients accepting gzip. The gzip
+# magic bytes tell them apart from plain values on read.
+CACHE_COMPRESSION = os.getenv("CACHE_COMPRESSION", "false").lower() == "true"
+CACHE_COMPRESSION_MIN_SIZE = int(os.getenv("CACHE_COMPRESSION_MIN_SIZE", 1000))
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Loads in progress in this process, concurrent misses on a key share one
+_inflight: "dict[str, asyncio.Future]" = {}
+
+LOCK_TTL_MS = 5000
+LOCK_WAIT_SECONDS = 1.0
+LOCK_POLL_SECONDS = 0.05
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def compress(value: str) -> bytes:
+    # Fixed mtime keeps the output, and so the stored bytes, deterministic
+    return gzip.compress(value.encode('utf-8'), compresslevel=6, mtime=0)
+
+def should_compress(value: str) -> bool:
+    return CACHE_COMPRESSION and len(value) >= CACHE_COMPRESSION_MIN_SIZE
+
+def _encode_value(value: Union[str, bytes]) -> Union[str, bytes]:
+    # Bytes are taken as already encoded
+    if isinstance(value, str) and should_compress(value):
+        return compress(value)
+    return value
+
+def decode_value(value: bytes) -> str:
+    if value.startswith(GZIP_MAGIC):
+        value = gzip.decompress(value)
+    return value.decode('utf-8')
+
+async def set_cache(resource: str, key: Union[int, str], value: Union[str, bytes], expire: int = 120) -> None:
     try:
         redis = await get_redis_client()
-        await redis.set(f"{resource}:{str(key)}", value, ex=expire)
-        logging.info(f"Cache set successfully for key: {key}")
+        await redis.set(f"{resource}:{str(key)}", _encode_value(value), ex=expire)
+        record_cache(resource, "set", "ok")
+        logger.info("Cache set successfully for key: %s", key)
     except Exception as e:
-        logging.error(f"Error setting cache for key: {key}, error: {str(e)}")
+        record_cache(resource, "set", "error")
+        logger.error("Error setting cache for key: %s, error: %s", key, e)
 
-async def get_cache(resource: str, key: int) -> dict:
+async def get_cache(resource: str, key: Union[int, str], with_ttl: bool = False, decode: bool = True) -> dict:
+    """Read one key; with decode=False a hit's value is the stored bytes, possibly gzipped."""
     try:
         redis = await get_redis_client()
         redis_key = f"{resource}:{str(key)}"
-        value = await redis.get(redis_key)
+        if with_ttl:
+            # Same round trip as a plain GET
+            async with redis.pipeline(transaction=False) as pipe:
+                value, ttl_ms = await pipe.get(redis_key).pttl(redis_key).execute()
+        else:
+            value = await redis.get(redis_key)
+        if value == TOMBSTONE.encode('utf-8'):
+            record_cache(resource, "get", "tombstone")
+            logger.info("Cache tombstone for key: %s", redis_key)
+            return {"success": False, "missing": True, "error": "Key marked missing"}
         if value:
-            logging.info(f"Cache hit for key: {redis_key}")
-            return {"success": True, "value": value.decode('utf-8')}
+            record_cache(resource, "get", "hit")
+            logger.info("Cache hit for key: %s", redis_key)
+            if decode:
+                value = decode_value(value)
+            if with_ttl and ttl_ms > 0:
+                return {"success": True, "value": value, "ttl": ttl_ms / 1000}
+            return {"success": True, "value": value}
         else:
-            logging.warning(f"Cache miss for key: {redis_key}")
+            record_cache(resource, "get", "miss")
+            logger.info("Cache miss for key: %s", redis_key)
             return {"success": False, "error": "Key not found"}
     except Exception as e:
-        logging.error(f"Error getting cache for key: {redis_key}, error: {str(e)}")
+        record_cache(resource, "get", "error")
+        logger.error("Error getting cache for key: %s, error: %s", redis_key, e)
         return {"success": False, "error": str(e)}
     
 async def delete_cache(resource: str, key: int) -> None:
@@ -30,6 +116,257 @@ async def delete_cache(resource: str, key: int) -> None:
         redis = await get_redis_client()
         redis_key = f"{resource}:{str(key)}"
         await redis.delete(redis_key)
-        logging.info(f"Cache deleted successfully for key: {redis_key}")
+        record_cache(resource, "delete", "ok")
+        logger.info("Cache deleted successfully for key: %s", redis_key)
+    except Exception as e:
+        record_cache(resource, "delete", "error")
+        logger.error("Error deleting cache for key: %s, error: %s", redis_key, e)
+
+async def get_many_cache(resource: str, keys: "list[Union[int, str]]") -> dict:
+    """Look up several keys with one MGET.
+
+    "values" maps each hit to its value and "missing" lists the keys holding
+    a tombstone; every other key is a plain miss.
+    """
+    if not keys:
+        return {"success": True, "values": {}, "missing": []}
+    try:
+        redis = await get_redis_client()
+        raw_values = await redis.mget([f"{resource}:{str(key)}" for key in keys])
+        values = {}
+        missing = []
+        for key, value in zip(keys, raw_values):
+            if value == TOMBSTONE.encode('utf-8'):
+                missing.append(key)
+            elif value:
+                values[key] = decode_value(value)
+        record_cache(resource, "get", "hit", len(values))
+        record_cache(resource, "get", "tombstone", len(missing))
+        record_cache(resource, "get", "miss", len(keys) - len(values) - len(missing))
+        logger.info("Cache hits for %s of %s %s keys", len(values), len(keys), resource)
+        return {"success": True, "values": values, "missing": missing}
+    except Exception as e:
+        record_cache(resource, "get", "error", len(keys))
+        logger.error("Error getting cache for %s %s keys, error: %s", len(keys), resource, e)
+        return {"success": False, "values": {}, "missing": [], "error": str(e)}
+
+async def set_many_cache(
+        resource: str,
+        values: "dict[Union[int, str], Union[str, bytes]]",
+        expire: int = 120,
+        missing: "list[Union[int, str]]" = (),
+    ) -> None:
+    """Write several values, and tombstones for the missing keys, in one pipeline."""
+    if not values and not missing:
+        return
+    try:
+        redis = await get_redis_client()
+        async with redis.pipeline(transaction=False) as pipe:
+            for key, value in values.items():
+                pipe.set(f"{resource}:{str(key)}", _encode_value(value), ex=expire)
+            for key in missing:
+                pipe.set(f"{resource}:{str(key)}", TOMBSTONE, ex=TOMBSTONE_TTL)
+            await pipe.execute()
+        record_cache(resource, "set", "ok", len(values) + len(missing))
+        logger.info("Cache set successfully for %s %s keys", len(values) + len(missing), resource)
+    except Exception as e:
+        record_cache(resource, "set", "error", len(values) + len(missing))
+        logger.error("Error setting cache for %s %s keys, error: %s", len(values) + len(missing), resource, e)
+
+async def set_tombstone(resource: str, key: Union[int, str], expire: int = TOMBSTONE_TTL) -> None:
+    await set_cache(resource, key, TOMBSTONE, expire=expire)
+
+
+# Cached queries embed their resource generation in the key, bumping it
+# makes every page cached under the previous generation unreachable at once.
+
+async def get_generation(resource: str) -> Optional[int]:
+    try:
+        redis = await get_redis_client()
+        value = await redis.get(f"{resource}:generation")
+        return int(value) if value else 0
+    except Exception as e:
+        logger.error("Error getting cache generation for: %s, error: %s", resource, e)
+        return None
+
+async def bump_generation(resource: str, settle_seconds: int = 0) -> None:
+    """Invalidate every cached query on resource.
+
+    With settle_seconds, the new generation also counts as settling for that
+    long, see generation_settling.
+    """
+    try:
+        redis = await get_redis_client()
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.incr(f"{resource}:generation")
+            if settle_seconds > 0:
+                pipe.set(f"{resource}:generation:settling", 1, ex=settle_seconds)
+            generation, *_ = await pipe.execute()
+        logger.info("Cache generation for %s bumped to %s", resource, generation)
     except Exception as e:
-        logging.error(f"Error deleting cache for key: {redis_key}, error: {str(e)}")
\ No newline at end of file
+        logger.error("Error bumping cache generation for: %s, error: %s", resource, e)
+
+async def generation_settling(resource: str) -> bool:
+    """Whether the generation was bumped within its settle window, assumed so if Redis fails."""
+    try:
+        redis = await get_redis_client()
+        return bool(await redis.exists(f"{resource}:generation:settling"))
+    except Exception as e:
+        logger.error("Error checking cache generation for: %s, error: %s", resource, e)
+        return True
+
+def query_key(generation: int, **params) -> str:
+    normalized = json.dumps(
+        {name: value for name, value in params.items() if value is not None},
+        sort_keys=True,
+        default=str,
+    )
+    return f"{generation}:{hashlib.sha1(normalized.encode('utf-8')).hexdigest()}"
+
+
+def get_local(resource: str, key: Union[int, str]) -> Optional[Any]:
+    local_key = f"{resource}:{str(key)}"
+    entry = _local_cache.get(local_key)
+    if entry is None:
+        record_cache(resource, "get_local", "miss")
+        return None
+    expires_at, value = entry
+    if expires_at < time.monotonic():
+        _local_cache.pop(local_key, None)
+        record_cache(resource, "get_local", "miss")
+        return None
+    _local_cache.move_to_end(local_key)
+    record_cache(resource, "get_local", "hit")
+    return value
+
+def set_local(resource: str, key: Union[int, str], value: Any) -> None:
+    local_key = f"{resource}:{str(key)}"
+    _local_cache[local_key] = (time.monotonic() + LOCAL_CACHE_TTL, value)
+    _local_cache.move_to_end(local_key)
+    while len(_local_cache) > LOCAL_CACHE_MAX_ITEMS:
+        _local_cache.popitem(last=False)
+
+def evict_local(resource: str, key: Union[int, str]) -> None:
+    _local_cache.pop(f"{resource}:{str(key)}", None)
+
+def clear_local() -> None:
+    _local_cache.clear()
+
+async def publish_invalidation(resource: str, key: Union[int, str]) -> None:
+    evict_local(resource, key)
+    try:
+        redis = await get_redis_client()
+        await redis.publish(INVALIDATION_CHANNEL, f"{resource}:{str(key)}")
+    except Exception as e:
+        logger.error("Error publishing invalidation for key: %s:%s, error: %s", resource, key, e)
+
+async def _listen_for_invalidations() -> None:
+    redis = await get_redis_client()
+    while True:
+        pubsub = redis.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            # Messages sent while unsubscribed are lost, start from a clean slate
+            clear_local()
+            async for message in pubsub.listen():
+                _local_cache.pop(message["data"].decode("utf-8"), None)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Cache invalidation listener failed, retrying: %s", e)
+            clear_local()
+            await asyncio.sleep(1)
+        finally:
+            await pubsub.aclose()
+
+def start_invalidation_listener() -> None:
+    global _invalidation_listener
+    if _invalidation_listener is None or _invalidation_listener.done():
+        _invalidation_listener = asyncio.create_task(_listen_for_invalidations())
+
+async def stop_invalidation_listener() -> None:
+    global _invalidation_listener
+    if _invalidation_listener is not None:
+        _invalidation_listener.cancel()
+        try:
+            await _invalidation_listener
+        except asyncio.CancelledError:
+            pass
+        _invalidation_listener = None
+
+
+def should_refresh_early(ttl: float, recompute_seconds: float, beta: float = 1.0) -> bool:
+    """Probabilistic early expiration (XFetch).
+
+    Each reader refreshes with a probability that grows as the remaining
+    TTL approaches the cost of recomputing the value, so one reader renews
+    a hot key shortly before it expires instead of all of them at once.
+    """
+    return -recompute_seconds * beta * math.log(1.0 - random.random()) >= ttl
+
+async def single_flight(resource: str, key: Union[int, str], loader: Callable[[], Awaitable[Any]]) -> Any:
+    """Run loader once per key at a time in this process, sharing its result."""
+    flight_key = f"{resource}:{str(key)}"
+    future = _inflight.get(flight_key)
+    if future is not None:
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # The leading load was cancelled rather than this caller, try again
+            if future.cancelled():
+                return await single_flight(resource, key, loader)
+            raise
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[flight_key] = future
+    try:
+        result = await loader()
+        future.set_result(result)
+        return result
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Marks the exception as retrieved when nobody else was waiting
+        future.exception()
+        raise
+    finally:
+        _inflight.pop(flight_key, None)
+
+async def acquire_lock(resource: str, key: Union[int, str], ttl_ms: int = LOCK_TTL_MS) -> Optional[str]:
+    """Take the cross-worker load lock for a key.
+
+    Returns the lock token, or None when another worker holds it. Redis
+    errors fail open with a token so callers go on loading.
+    """
+    token = secrets.token_hex(8)
+    try:
+        redis = await get_redis_client()
+        acquired = await redis.set(f"lock:{resource}:{str(key)}", token, nx=True, px=ttl_ms)
+        return token if acquired else None
+    except Exception as e:
+        logger.error("Error acquiring lock for key: %s:%s, error: %s", resource, key, e)
+        return token
+
+async def release_lock(resource: str, key: Union[int, str], token: str) -> None:
+    try:
+        redis = await get_redis_client()
+        await redis.eval(RELEASE_LOCK_SCRIPT, 1, f"lock:{resource}:{str(key)}", token)
+    except Exception as e:
+        logger.error("Error releasing lock for key: %s:%s, error: %s", resource, key, e)
+
+async def wait_for_cache(
+        resource: str,
+        key: Union[int, str],
+        timeout: float = LOCK_WAIT_SECONDS,
+        decode: bool = True,
+    ) -> dict:
+    """Poll for a value another worker is loading, up to timeout seconds."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        await asyncio.sleep(LOCK_POLL_SECONDS)
+        cache_result = await get_cache(resource, key, decode=decode)
+        if cache_result.get("success") or cache_result.get("missing"):
+            return cache_result
+    return {"success": False, "error": "Timed out waiting for cache"}
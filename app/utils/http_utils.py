@@ -0,0 +1,142 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Union
+from fastapi import Request, Response, status
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, IdentityResponder
+from starlette.types import Receive, Scope, Send
+from dotenv import load_dotenv
+import hashlib
+import os
+
+load_dotenv()
+
+# Responses smaller than this go out uncompressed, the saving is not worth the CPU
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1000))
+
+
+def make_etag(payload: Union[str, bytes]) -> str:
+    """Strong ETag for a serialized response body."""
+    if isinstance(payload, str):
+        payload = payload.encode()
+    return '"' + hashlib.sha1(payload).hexdigest() + '"'
+
+
+def http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _parse_http_date(value: str) -> Optional[datetime]:
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _coding_weights(accept_encoding: str) -> "dict[str, float]":
+    """Content codings of an Accept-Encoding value mapped to their q-values."""
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[coding.lower()] = quality
+    return weights
+
+
+def gzip_accepted(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding value takes gzip, q=0 refuses it and * stands in for codings not listed."""
+    weights = _coding_weights(accept_encoding)
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in weights:
+            return weights[coding] > 0
+    return False
+
+
+def accepts_gzip(request: Request) -> bool:
+    return gzip_accepted(request.headers.get("accept-encoding", ""))
+
+
+class NegotiatingGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that honours q-values, the stock one compresses whenever "gzip" appears in the header."""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and not gzip_accepted(Headers(scope=scope).get("accept-encoding", "")):
+            responder = IdentityResponder(self.app, self.minimum_size, exclude_content_types=self.exclude_content_types)
+            await responder(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    # If-None-Match wins over If-Modified-Since when both are sent (RFC 9110, 13.2.2)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # GET compares weakly, so a W/ prefix from an intermediary still matches
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag.removeprefix("W/") in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    since = _parse_http_date(if_modified_since)
+    if since is None:
+        return False
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # HTTP dates have one second resolution
+    return last_modified.replace(microsecond=0) <= since
+
+
+def _representation_etag(etag: str, content: Union[str, bytes], content_encoding: Optional[str]) -> str:
+    # A strong ETag identifies one byte sequence, so each content coding gets its own.
+    # Bodies large enough for the compression middleware may still be encoded after
+    # this point, and only a weak validator stays true for both variants.
+    if content_encoding is not None:
+        return f'{etag[:-1]}-{content_encoding}"'
+    if len(content) >= COMPRESSION_MIN_SIZE:
+        return "W/" + etag
+    return etag
+
+
+def conditional_response(
+        request: Request,
+        content: Union[str, bytes],
+        etag: Optional[str] = None,
+        last_modified: Optional[datetime] = None,
+        media_type: str = "application/json",
+        content_encoding: Optional[str] = None
+    ) -> Response:
+    """JSON response carrying validators, or a bodiless 304 when the client copy is current.
+
+    content_encoding marks content as already encoded, the compression middleware
+    then passes it through. etag is the validator of the unencoded payload, it is
+    adjusted here to the representation actually sent.
+    """
+    if etag is None:
+        etag = make_etag(content)
+    etag = _representation_etag(etag, content, content_encoding)
+    headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if content_encoding is not None:
+        headers["Content-Encoding"] = content_encoding
+    return Response(content=content, media_type=media_type, headers=headers)
@@ -0,0 +1,41 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Tuple
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(*key: Any) -> str:
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in key]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> Tuple[Any, ...]:
+    """Decode a cursor built by encode_cursor, converting each value to the given type.
+
+    Values may be null; anything malformed is rejected with a 400.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("cursor does not match the expected key")
+
+        key = []
+        for value, type_ in zip(values, types):
+            if value is None:
+                key.append(None)
+            elif type_ is datetime:
+                key.append(datetime.fromisoformat(value))
+            elif type_ is int and not isinstance(value, int):
+                raise ValueError("cursor id must be an integer")
+            else:
+                key.append(type_(value))
+        return tuple(key)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor.",
+        )
@@ -1,8 +1,31 @@
-from sqlalchemy.orm import Session
-from app.config.database import SessionLocal
-from app.models.article import Article
-from datetime import datetime, timedelta
+"""Synthetic articles for local runs and scale tests.
+
+    python -m app.utils.seed_test_data                      # 100 rows, skipped if data exists
+    python -m app.utils.seed_test_data --count 10000000 --workers 8 --defer-indexes
+
+Rows are generated in blocks of RNG_BLOCK, each from its own generator seeded by
+--seed and the block number, so the same --seed, --count and --until produce the
+same rows whatever the worker count or batch size. They are loaded with COPY, one
+connection per worker process.
+
+Titles carry a running number that starts after the last id handed out by the
+articles sequence, so loading with --force into a table that already has rows,
+seeded or not, never repeats a (title, author) pair. Into a fresh table the
+numbering starts at 1 and the rows are fully repeatable.
+"""
+from sqlalchemy.engine import make_url
+from app.config.database import DATABASE_URL
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from multiprocessing import Pool
+from typing import Iterator, List, Optional, Tuple
+import argparse
+import io
+import math
+import os
+import psycopg2
 import random
+import time
 
 FIRST_NAMES = [
     "Alice", "Bob", "Charlie", "Diana", "Eve", "Frank", "Grace", "Hank", "Ivy", "Jack", "Karen", "Leo", "Mona", "Nate", "Olivia", "Paul", "Quinn", "Rita", "Sam", "Tina"
@@ -73,51 +96,260 @@ TAGS = [
     ["space", "astronomy"], ["social media", "society"], ["cybersecurity", "tech"],
     ["transportation", "innovation"]
 ]
+EXTRA_TAGS = [
+    "climate", "finance", "education", "robotics", "programming", "data", "cloud", "mobile",
+    "music", "sports", "food", "travel", "fashion", "marketing", "retail", "security",
+    "privacy", "open source", "startups", "policy", "agriculture", "medicine", "gaming", "media",
+]
+MIDDLE_INITIALS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+RNG_BLOCK = 1000
+# Share of articles without a publication date, i.e. drafts
+DRAFT_RATE = 0.03
+# Most articles are recent, the tail reaches back this far
+MAX_AGE_DAYS = 3650
+MEAN_AGE_DAYS = 400
+BODY_WORDS_MEDIAN = 250
+BODY_WORDS_SIGMA = 0.7
+BODY_WORDS_RANGE = (30, 4000)
+TAG_COUNT_WEIGHTS = [5, 25, 35, 20, 10, 5]
+
+COPY_SQL = "COPY articles (title, author, body, tags, published_at) FROM STDIN"
+
+
+def _zipf_cum_weights(size: int, exponent: float) -> List[float]:
+    return list(accumulate(1 / (rank ** exponent) for rank in range(1, size + 1)))
+
+
+# A few prolific authors and a long tail; same for tag popularity. The fixed
+# shuffle spreads the popular ranks over different names.
+AUTHORS = [f"{first} {last}" for first in FIRST_NAMES for last in LAST_NAMES] + [
+    f"{first} {initial}. {last}" for initial in MIDDLE_INITIALS for first in FIRST_NAMES for last in LAST_NAMES
+]
+random.Random(0).shuffle(AUTHORS)
+AUTHOR_CUM_WEIGHTS = _zipf_cum_weights(len(AUTHORS), exponent=0.8)
+TAG_VOCABULARY = list(dict.fromkeys([tag for pair in TAGS for tag in pair] + EXTRA_TAGS))
+TAG_CUM_WEIGHTS = _zipf_cum_weights(len(TAG_VOCABULARY), exponent=0.9)
+BODY_WORDS = BODY.split()
+
+
+def _body(rng: random.Random) -> str:
+    words = int(rng.lognormvariate(math.log(BODY_WORDS_MEDIAN), BODY_WORDS_SIGMA))
+    words = min(max(words, BODY_WORDS_RANGE[0]), BODY_WORDS_RANGE[1])
+    start = rng.randrange(len(BODY_WORDS))
+    # Wrap around the sample text for long bodies
+    picked = (BODY_WORDS[(start + offset) % len(BODY_WORDS)] for offset in range(words))
+    return " ".join(picked)
+
+
+def _tags(rng: random.Random) -> List[str]:
+    count = rng.choices(range(len(TAG_COUNT_WEIGHTS)), weights=TAG_COUNT_WEIGHTS)[0]
+    tags = set()
+    while len(tags) < count:
+        tags.add(rng.choices(TAG_VOCABULARY, cum_weights=TAG_CUM_WEIGHTS)[0])
+    return sorted(tags)
+
+
+def _published_at(rng: random.Random, until: datetime) -> Optional[datetime]:
+    if rng.random() < DRAFT_RATE:
+        return None
+    age_days = min(rng.expovariate(1 / MEAN_AGE_DAYS), MAX_AGE_DAYS)
+    return (until - timedelta(days=age_days)).replace(microsecond=0)
+
+
+def generate_block(
+        block: int,
+        random_seed: int,
+        count: int,
+        until: datetime,
+        first_number: int = 1
+    ) -> Iterator[Tuple]:
+    """Rows block * RNG_BLOCK up to count, always the same for the same arguments."""
+    rng = random.Random(f"{random_seed}:{block}")
+    for index in range(block * RNG_BLOCK, min((block + 1) * RNG_BLOCK, count)):
+        # The running number keeps (title, author) unique across any count
+        title = f"{rng.choice(TITLES)} #{first_number + index}"
+        author = rng.choices(AUTHORS, cum_weights=AUTHOR_CUM_WEIGHTS)[0]
+        yield title, author, _body(rng), _tags(rng), _published_at(rng, until)
+
+
+def _copy_text(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def _copy_array(values: List[str]) -> str:
+    items = ('"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"' for value in values)
+    return "{" + ",".join(items) + "}"
+
+
+def _copy_rows(rows: Iterator[Tuple], buffer: io.StringIO) -> None:
+    for title, author, body, tags, published_at in rows:
+        buffer.write("\t".join((
+            _copy_text(title),
+            _copy_text(author),
+            _copy_text(body),
+            _copy_text(_copy_array(tags)),
+            published_at.isoformat(sep=" ") if published_at else "\\N",
+        )))
+        buffer.write("\n")
+
+
+def _dsn() -> str:
+    # psycopg2 wants a plain libpq URL, without a SQLAlchemy driver suffix
+    return make_url(DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+_connection = None
+
+
+def _init_worker(dsn: str) -> None:
+    global _connection
+    _connection = psycopg2.connect(dsn)
+
+
+def _load_batch(args: Tuple[List[int], int, int, datetime, int]) -> int:
+    blocks, random_seed, count, until, first_number = args
+    buffer = io.StringIO()
+    for block in blocks:
+        _copy_rows(generate_block(block, random_seed, count, until, first_number), buffer)
+    buffer.seek(0)
+    with _connection.cursor() as cursor:
+        cursor.copy_expert(COPY_SQL, buffer)
+        rows = cursor.rowcount
+    _connection.commit()
+    return rows
+
+
+def _first_number(cursor) -> int:
+    """Title number to start from, past every id the articles sequence has handed out."""
+    cursor.execute("SELECT pg_get_serial_sequence('articles', 'id')")
+    sequence = cursor.fetchone()[0]
+    cursor.execute(f"SELECT CASE WHEN is_called THEN last_value ELSE 0 END FROM {sequence}")
+    return cursor.fetchone()[0] + 1
+
+
+def _drop_indexes(cursor) -> List[Tuple[str, str]]:
+    """Drop the non-unique secondary indexes on articles, returning their names and definitions.
+
+    Unique indexes stay, they guard (title, author) during the load and a
+    duplicate could not be rebuilt into them afterwards.
+    """
+    cursor.execute(
+        """
+        SELECT index_class.relname, pg_get_indexdef(index_class.oid)
+        FROM pg_index
+        JOIN pg_class index_class ON index_class.oid = pg_index.indexrelid
+        WHERE pg_index.indrelid = 'articles'::regclass
+          AND NOT pg_index.indisunique
+        """
+    )
+    indexes = cursor.fetchall()
+    for name, _ in indexes:
+        cursor.execute(f'DROP INDEX "{name}"')
+    return indexes
+
+
+def _rebuild_indexes(connection, indexes: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Recreate each index in its own transaction, returning the ones that failed."""
+    failed = []
+    for name, definition in indexes:
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(definition)
+            connection.commit()
+        except psycopg2.Error as error:
+            connection.rollback()
+            print(f"❌ Could not rebuild index {name}: {error}".strip())
+            failed.append((name, definition))
+    return failed
+
+
+def seed(
+        count: int = 100,
+        workers: Optional[int] = None,
+        random_seed: int = 42,
+        batch_size: int = 50000,
+        until: Optional[date] = None,
+        force: bool = False,
+        defer_indexes: bool = False
+    ) -> None:
+    workers = workers or os.cpu_count() or 1
+    until = datetime.combine(until or date.today(), datetime.min.time())
+    connection = psycopg2.connect(_dsn())
+    try:
+        with connection.cursor() as cursor:
+            # Skip seeding if data already exists
+            cursor.execute("SELECT 1 FROM articles LIMIT 1")
+            if cursor.fetchone() and not force:
+                print("✅ Test data already exists, skipping...")
+                return
+
+            first_number = _first_number(cursor)
+            dropped_indexes = _drop_indexes(cursor) if defer_indexes else []
+        connection.commit()
+
+        started = time.perf_counter()
+        blocks = list(range(math.ceil(count / RNG_BLOCK)))
+        blocks_per_batch = max(batch_size // RNG_BLOCK, 1)
+        batches = [
+            (blocks[start:start + blocks_per_batch], random_seed, count, until, first_number)
+            for start in range(0, len(blocks), blocks_per_batch)
+        ]
+        loaded = 0
+        try:
+            with Pool(min(workers, len(batches)) or 1, initializer=_init_worker, initargs=(_dsn(),)) as pool:
+                for rows in pool.imap_unordered(_load_batch, batches):
+                    loaded += rows
+                    print(f"  {loaded}/{count} articles loaded ({time.perf_counter() - started:.0f}s)")
+        finally:
+            # Put dropped indexes back even when the load failed part way
+            if dropped_indexes:
+                print(f"  Rebuilding {len(dropped_indexes)} indexes...")
+            failed_indexes = _rebuild_indexes(connection, dropped_indexes)
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE articles")
+            connection.commit()
+            if failed_indexes:
+                statements = "\n".join(f"  {definition};" for _, definition in failed_indexes)
+                raise RuntimeError(f"{len(failed_indexes)} indexes were not rebuilt, recreate them with:\n{statements}")
+    finally:
+        connection.close()
+    print(f"✅ Seeded {count} test articles in {time.perf_counter() - started:.0f}s.")
 
 
-def seed():
-    db: Session = SessionLocal()
-
-    # Skip seeding if data already exists
-    if db.query(Article).first():
-        print("✅ Test data already exists, skipping...")
-        db.close()
-        return
-    
-    used_titles = {}
-
-    for _ in range(100):
-        author = f"{random.choice(FIRST_NAMES)} {random.choice(LAST_NAMES)}"
-        if author not in used_titles:
-            used_titles[author] = set()
-
-        available_titles = [t for t in TITLES if t not in used_titles[author]]
-        if not available_titles:
-            # If all titles used for this author, reset their set
-            used_titles[author] = set()
-            available_titles = TITLES.copy()
-
-        title = random.choice(available_titles)
-        used_titles[author].add(title)
-
-        body_start = random.randint(0, max(0, len(BODY) - 500))
-        body_length = random.randint(300, 800)
-        body = BODY[body_start:body_start + body_length]
-        tags = random.choice(TAGS)
-        published_at = datetime.now() - timedelta(days=random.randint(0, 365))
-
-        article = Article(
-            author=author,
-            title=title,
-            body=body,
-            tags=tags,
-            published_at=published_at
-        )
-        db.add(article)
-    db.commit()
-    db.close()
-    print("✅ Seeded 100 test articles.")
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load synthetic articles through COPY.")
+    parser.add_argument("--count", type=int, default=100, help="Articles to generate")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes, defaults to the CPU count")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed, the same seed gives the same rows")
+    parser.add_argument("--batch-size", type=int, default=50000, help="Rows per COPY and transaction")
+    parser.add_argument(
+        "--until",
+        type=date.fromisoformat,
+        default=None,
+        help="Newest publication date as YYYY-MM-DD, defaults to today; pin it for repeatable dates",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Add articles even if the table already has some, numbering the new titles after the existing ids",
+    )
+    parser.add_argument(
+        "--defer-indexes",
+        action="store_true",
+        help="Drop secondary indexes during the load and rebuild them after, much faster for large counts",
+    )
+    args = parser.parse_args()
+    seed(
+        count=args.count,
+        workers=args.workers,
+        random_seed=args.seed,
+        batch_size=args.batch_size,
+        until=args.until,
+        force=args.force,
+        defer_indexes=args.defer_indexes,
+    )
 
 
 if __name__ == "__main__":
-    seed()
+    main()
@@ -0,0 +1,129 @@
+import argparse
+import json
+import math
+import platform
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+# A p95 or throughput this much worse than the baseline is reported as a regression
+DEFAULT_TOLERANCE = 0.15
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of samples, which must be sorted."""
+    if not samples:
+        return 0.0
+    rank = max(math.ceil(fraction * len(samples)) - 1, 0)
+    return samples[rank]
+
+
+def summarize(name: str, latencies: List[float], elapsed: float, errors: int = 0) -> Dict:
+    latencies = sorted(latencies)
+    return {
+        "name": name,
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+    }
+
+
+async def measure(
+        name: str,
+        operation: Callable[[], Awaitable],
+        iterations: int,
+        warmup: int = 5,
+        setup: Optional[Callable[[], Awaitable]] = None
+    ) -> Dict:
+    """Run operation sequentially and summarize its latency, setup runs untimed before each call."""
+    for _ in range(warmup):
+        if setup is not None:
+            await setup()
+        await operation()
+    latencies = []
+    elapsed = 0.0
+    for _ in range(iterations):
+        if setup is not None:
+            await setup()
+        call_started = time.perf_counter()
+        await operation()
+        latency = time.perf_counter() - call_started
+        latencies.append(latency)
+        elapsed += latency
+    return summarize(name, latencies, elapsed)
+
+
+def print_results(results: List[Dict]) -> None:
+    header = f"{'benchmark':<32}{'reqs':>8}{'err':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        print(
+            f"{result['name']:<32}{result['requests']:>8}{result['errors']:>6}"
+            f"{result['throughput']:>10.1f}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+        )
+
+
+def save_baseline(suite: str, results: List[Dict]) -> Path:
+    BASELINE_DIR.mkdir(exist_ok=True)
+    path = BASELINE_DIR / f"{suite}.json"
+    payload = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": {result["name"]: result for result in results},
+    }
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+    return path
+
+
+def compare_baseline(suite: str, results: List[Dict], tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """Regressions against the saved baseline, an empty list when none or no baseline."""
+    path = BASELINE_DIR / f"{suite}.json"
+    if not path.exists():
+        return []
+    baseline = json.loads(path.read_text())["results"]
+    regressions = []
+    for result in results:
+        previous = baseline.get(result["name"])
+        if previous is None:
+            continue
+        if result["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{result['name']}: p95 {previous['p95_ms']:.2f} ms -> {result['p95_ms']:.2f} ms"
+            )
+        if result["throughput"] < previous["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{result['name']}: throughput {previous['throughput']:.1f} -> {result['throughput']:.1f} req/s"
+            )
+    return regressions
+
+
+def add_baseline_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed slowdown against the baseline before failing, as a fraction",
+    )
+
+
+def report(suite: str, results: List[Dict], args: argparse.Namespace) -> int:
+    """Print results, then save or check the baseline. Returns the process exit code."""
+    print_results(results)
+    if args.save_baseline:
+        print(f"\nBaseline saved to {save_baseline(suite, results)}")
+        return 0
+    regressions = compare_baseline(suite, results, args.tolerance)
+    if regressions:
+        print("\nRegressions against the baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    return 0
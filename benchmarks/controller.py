@@ -0,0 +1,151 @@
+"""Controller-level benchmarks against the Postgres and Redis in DATABASE_URL / REDIS_*.
+
+    python -m benchmarks.controller --articles 1000 --iterations 200
+"""
+from sqlalchemy import delete
+from app.articles import controller
+from app.articles.schema import ArticleCreate
+from app.config.database import AsyncSessionLocal
+from app.models.article import Article
+from app.services import cache_service
+from benchmarks.common import add_baseline_arguments, measure, report
+import argparse
+import asyncio
+import itertools
+import logging
+import random
+import sys
+import uuid
+
+
+SUITE = "controller"
+PAGE_SIZE = 20
+SEARCH_TERMS = ["quantum", "energy", "future", "science", "machine learning", "climate"]
+WORDS = (
+    "future science energy quantum climate data learning machine network health "
+    "robot city ocean space brain market music travel food water"
+).split()
+
+
+def _article(prefix: str, index: int, rng: random.Random) -> ArticleCreate:
+    return ArticleCreate(
+        title=f"{prefix} {' '.join(rng.sample(WORDS, 3)).title()} {index}",
+        author=f"Bench Author {rng.randrange(50)}",
+        tags=rng.sample(WORDS, 2),
+        body=" ".join(rng.choices(WORDS, k=400)),
+    )
+
+
+async def _seed(prefix: str, count: int, rng: random.Random) -> list:
+    ids = []
+    async with AsyncSessionLocal() as db:
+        for start in range(0, count, 1000):
+            batch = [_article(prefix, index, rng) for index in range(start, min(start + 1000, count))]
+            result = await controller.bulk_create_articles(db, batch)
+            ids.extend(item.id for item in result.items if item.id is not None)
+    return ids
+
+
+async def _cleanup(prefix: str) -> None:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            delete(Article).where(Article.title.startswith(prefix)).returning(Article.id)
+        )
+        deleted_ids = list(result.scalars())
+        await db.commit()
+    # The Redis may be shared with a running app, which would keep serving the
+    # deleted articles from their cached entries until those expire
+    await cache_service.set_many_cache("article", {}, missing=deleted_ids)
+    for article_id in deleted_ids:
+        await cache_service.publish_invalidation("article", article_id)
+    await cache_service.bump_generation("articles")
+    cache_service.clear_local()
+
+
+async def run(args: argparse.Namespace) -> list:
+    rng = random.Random(args.seed)
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+    article_ids = await _seed(prefix, args.articles, rng)
+    pages = itertools.cycle(range(1, max(args.articles // PAGE_SIZE, 1) + 1))
+    terms = itertools.cycle(SEARCH_TERMS)
+    created = itertools.count()
+
+    async def list_page():
+        async with AsyncSessionLocal() as db:
+            await controller.get_articles(db, page=next(pages), page_size=PAGE_SIZE)
+
+    async def search_page():
+        async with AsyncSessionLocal() as db:
+            await controller.search_articles(db, next(terms), page=1, page_size=PAGE_SIZE)
+
+    async def first_page():
+        async with AsyncSessionLocal() as db:
+            await controller.get_articles(db, page=1, page_size=PAGE_SIZE)
+
+    async def first_search_page():
+        async with AsyncSessionLocal() as db:
+            await controller.search_articles(db, SEARCH_TERMS[0], page=1, page_size=PAGE_SIZE)
+
+    async def create():
+        async with AsyncSessionLocal() as db:
+            await controller.create_article(db, _article(f"{prefix} new", next(created), rng))
+
+    async def uncache_lists():
+        await cache_service.bump_generation("articles")
+
+    async def uncache_articles():
+        cache_service.clear_local()
+        for article_id in article_ids:
+            await cache_service.delete_cache("article", article_id)
+
+    async def uncache_local():
+        cache_service.clear_local()
+
+    try:
+        iterations = args.iterations
+        results = [
+            await measure("get_articles (uncached)", list_page, iterations, setup=uncache_lists),
+            await measure("get_articles (cached)", first_page, iterations),
+            await measure("search_articles (uncached)", search_page, iterations, setup=uncache_lists),
+            await measure("search_articles (cached)", first_search_page, iterations),
+        ]
+        # Clearing every key per call would dominate, so cold reads walk ids not read yet
+        await uncache_articles()
+        sampled_ids = rng.sample(article_ids, min(len(article_ids), iterations + 5))
+        cold_ids = iter(sampled_ids)
+
+        async def read_cold_article():
+            async with AsyncSessionLocal() as db:
+                await controller.get_article(db, next(cold_ids))
+
+        async def read_article():
+            async with AsyncSessionLocal() as db:
+                await controller.get_article(db, rng.choice(sampled_ids))
+
+        results += [
+            await measure("get_article (cold)", read_cold_article, len(sampled_ids) - 5),
+            await measure("get_article (redis)", read_article, iterations, setup=uncache_local),
+            await measure("get_article (local)", read_article, iterations),
+            await measure("create_article", create, iterations),
+        ]
+        return results
+    finally:
+        await _cleanup(prefix)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=1000, help="Articles to seed before measuring")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed calls per benchmark")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for data and access patterns")
+    add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    # Per-call log lines would be measured too
+    logging.disable(logging.INFO)
+    results = asyncio.run(run(args))
+    return report(SUITE, results, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
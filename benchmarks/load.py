@@ -0,0 +1,105 @@
+"""Concurrent HTTP load against app.main:app, in process or at --base-url.
+
+    python -m benchmarks.load --concurrency 50 --duration 20
+
+Rate limits would cap the run, start a standalone server with RATELIMIT_ENABLED=false.
+"""
+from benchmarks.common import add_baseline_arguments, report, summarize
+from dotenv import load_dotenv
+import argparse
+import asyncio
+import httpx
+import logging
+import os
+import random
+import sys
+import time
+
+
+load_dotenv()
+
+SUITE = "http"
+API_KEY = os.getenv("API_KEY")
+API_KEY_NAME = os.getenv("API_KEY_NAME")
+SEARCH_TERMS = ["quantum", "energy", "future", "science", "climate"]
+
+
+def _scenarios(article_ids: list, rng: random.Random) -> dict:
+    """Request builders by name, each returning a method, url and JSON body."""
+    return {
+        "GET /articles/": lambda: ("GET", f"/articles/?page={rng.randint(1, 5)}&page_size=20", None),
+        "GET /articles/search/": lambda: ("GET", f"/articles/search/?q={rng.choice(SEARCH_TERMS)}", None),
+        "GET /articles/{id}": lambda: ("GET", f"/articles/{rng.choice(article_ids)}", None),
+    }
+
+
+async def _worker(client: httpx.AsyncClient, build, deadline: float, latencies: list, errors: list) -> None:
+    while time.perf_counter() < deadline:
+        method, url, body = build()
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, json=body)
+            failed = response.status_code >= 400
+        except httpx.HTTPError:
+            failed = True
+        if failed:
+            errors.append(url)
+        else:
+            latencies.append(time.perf_counter() - started)
+
+
+async def _article_ids(client: httpx.AsyncClient) -> list:
+    response = await client.get("/articles/?page=1&page_size=100&fields=title")
+    response.raise_for_status()
+    article_ids = [article["id"] for article in response.json()["articles"]]
+    if not article_ids:
+        raise SystemExit("No articles to read, seed the database first (python -m app.utils.seed_test_data)")
+    return article_ids
+
+
+async def run(args: argparse.Namespace) -> list:
+    headers = {API_KEY_NAME: API_KEY}
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, headers=headers, timeout=30)
+    else:
+        from app.main import app
+        from app.rate_limiting import limiter
+        limiter.enabled = False
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://benchmark", headers=headers, timeout=30
+        )
+
+    rng = random.Random(args.seed)
+    results = []
+    async with client:
+        scenarios = _scenarios(await _article_ids(client), rng)
+        for name, build in scenarios.items():
+            if args.scenario and name not in args.scenario:
+                continue
+            latencies, errors = [], []
+            started = time.perf_counter()
+            deadline = started + args.duration
+            await asyncio.gather(
+                *(_worker(client, build, deadline, latencies, errors) for _ in range(args.concurrency))
+            )
+            results.append(summarize(name, latencies, time.perf_counter() - started, len(errors)))
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", help="Benchmark a running server instead of the app in process")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per scenario")
+    parser.add_argument("--scenario", action="append", help="Run only this scenario, can be repeated")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the request mix")
+    add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    results = asyncio.run(run(args))
+    return report(SUITE, results, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
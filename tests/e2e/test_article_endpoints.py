@@ -1,6 +1,10 @@
-from tests.conftest import client
+from tests.conftest import client, stored_article
 from dotenv import load_dotenv
+from fastapi.testclient import TestClient
+from app.main import app
+from app.rate_limiting import limiter
 import os
+import uuid
 
 load_dotenv()
 
@@ -33,6 +37,12 @@ def test_get_articles(client):
     assert isinstance(data["articles"], list)
 
 
+def test_get_articles_server_timing(client):
+    response = client.get("/articles/?page=1&page_size=10", headers={API_KEY_NAME: API_KEY})
+    assert response.status_code == 200
+    assert response.headers["server-timing"].startswith("db;dur=")
+
+
 def test_get_article(client):
     # Create article first
     payload = {
@@ -52,6 +62,57 @@ def test_get_article(client):
     assert data["title"] == payload["title"]
 
 
+def test_get_article_not_modified(client, stored_article):
+    article_id = stored_article(title="Conditional Article", body="Conditional body.", tags=["etag"])
+
+    first = client.get(f"/articles/{article_id}", headers={API_KEY_NAME: API_KEY})
+    assert first.status_code == 200
+    assert "last-modified" in first.headers
+
+    # Revalidate with the ETag
+    response = client.get(
+        f"/articles/{article_id}",
+        headers={API_KEY_NAME: API_KEY, "If-None-Match": first.headers["etag"]}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == first.headers["etag"]
+
+    # Revalidate with the date
+    response = client.get(
+        f"/articles/{article_id}",
+        headers={API_KEY_NAME: API_KEY, "If-Modified-Since": first.headers["last-modified"]}
+    )
+    assert response.status_code == 304
+
+
+def test_get_article_etag_per_encoding(client, stored_article):
+    title = "Encoded Article"
+    article_id = stored_article(
+        title=title, body="A body long enough to be worth compressing. " * 100, tags=["etag"]
+    )
+
+    gzipped = client.get(f"/articles/{article_id}", headers={API_KEY_NAME: API_KEY, "Accept-Encoding": "gzip"})
+    identity = client.get(f"/articles/{article_id}", headers={API_KEY_NAME: API_KEY, "Accept-Encoding": "identity"})
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in identity.headers
+    assert gzipped.headers["etag"] != identity.headers["etag"]
+
+    # gzip;q=0 refuses gzip even though the name appears in the header
+    refused = client.get(
+        f"/articles/{article_id}", headers={API_KEY_NAME: API_KEY, "Accept-Encoding": "identity, gzip;q=0"}
+    )
+    assert "content-encoding" not in refused.headers
+    assert refused.json()["title"] == title
+
+    # A validator of one coding does not revalidate the other
+    response = client.get(
+        f"/articles/{article_id}",
+        headers={API_KEY_NAME: API_KEY, "Accept-Encoding": "identity", "If-None-Match": gzipped.headers["etag"]}
+    )
+    assert response.status_code == 200
+
+
 def test_update_article(client):
     # Create article
     payload = {
@@ -93,4 +154,17 @@ def test_delete_article(client):
     # Try to get deleted article
     get_resp = client.get(f"/articles/{article_id}", headers={API_KEY_NAME: API_KEY})
     assert get_resp.status_code == 404
-    
\ No newline at end of file
+    
+
+def test_rate_limit_exceeded(monkeypatch):
+    monkeypatch.setattr(limiter, "enabled", True)
+    # A client address of its own, so earlier tests and runs do not share its window
+    with TestClient(app, client=(f"10.{uuid.uuid4().int % 250}.{os.getpid() % 250}.1", 50000)) as limited_client:
+        responses = [
+            limited_client.delete("/articles/1", headers={API_KEY_NAME: "not-the-key"}) for _ in range(11)
+        ]
+
+    assert [response.status_code for response in responses[:10]] == [403] * 10
+    assert responses[10].status_code == 429
+    assert responses[10].json() == {"error": "Rate limit exceeded: 10 per 1 minute"}
+    assert 1 <= int(responses[10].headers["retry-after"]) <= 60
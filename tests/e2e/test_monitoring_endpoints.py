@@ -0,0 +1,66 @@
+from tests.conftest import client, stored_article
+from dotenv import load_dotenv
+from prometheus_client.parser import text_string_to_metric_families
+import os
+
+load_dotenv()
+
+API_KEY = os.getenv("API_KEY")
+API_KEY_NAME = os.getenv("API_KEY_NAME")
+
+
+def test_pool_stats(client):
+    response = client.get("/health/pool", headers={API_KEY_NAME: API_KEY})
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == {"sync", "async", "replicas"}
+    for key in ("size", "max_overflow", "checked_in", "checked_out", "overflow"):
+        assert key in data["sync"]
+    # The async engine's pool also times its checkouts
+    for key in ("checkouts", "timeouts", "wait_seconds_avg", "wait_seconds_max"):
+        assert key in data["async"]
+    assert data["async"]["wait_seconds_max"] >= 0
+
+
+def test_pool_stats_requires_api_key(client):
+    response = client.get("/health/pool", headers={API_KEY_NAME: "not-the-key"})
+    assert response.status_code == 403
+
+
+def _samples(client, name):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    return [
+        sample
+        for family in text_string_to_metric_families(response.text)
+        for sample in family.samples
+        if sample.name == name
+    ]
+
+
+def test_metrics_request_latency_by_route(client, stored_article):
+    article_id = stored_article(title="Metrics Article", tags=["metrics"])
+    client.get(f"/articles/{article_id}", headers={API_KEY_NAME: API_KEY})
+
+    counts = _samples(client, "http_request_duration_seconds_count")
+    # Labelled with the route template, the id never shows up in a label
+    assert any(
+        sample.labels == {"method": "GET", "route": "/articles/{article_id}", "status": "200"}
+        for sample in counts
+    )
+    assert not any(str(article_id) in sample.labels["route"] for sample in counts)
+
+
+def test_metrics_cache_operations_counted(client, stored_article):
+    article_id = stored_article(title="Cached Metrics Article", tags=["metrics"])
+
+    def article_operations():
+        return sum(
+            sample.value
+            for sample in _samples(client, "cache_operations_total")
+            if sample.labels["resource"] == "article"
+        )
+
+    before = article_operations()
+    client.get(f"/articles/{article_id}", headers={API_KEY_NAME: API_KEY})
+    assert article_operations() > before
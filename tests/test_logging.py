@@ -0,0 +1,119 @@
+import json
+import logging
+import queue
+import threading
+from logging.handlers import QueueListener
+
+from app.logging import JsonFormatter, SamplingFilter, _LazyQueueHandler, _parse_sampling
+
+
+class CapturingHandler(logging.Handler):
+    """Keeps formatted records and the thread that formatted them"""
+
+    def __init__(self):
+        super().__init__()
+        self.setFormatter(JsonFormatter())
+        self.entries = []
+        self.done = threading.Event()
+
+    def emit(self, record):
+        self.entries.append(json.loads(self.format(record)))
+        self.done.set()
+
+
+class RenderProbe:
+    """Format argument that remembers which thread rendered it"""
+
+    def __init__(self):
+        self.rendered_in = None
+
+    def __str__(self):
+        self.rendered_in = threading.get_ident()
+        return "probe"
+
+
+def make_record(level=logging.INFO, msg="message", args=(), **extra):
+    record = logging.LogRecord("app.test", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestJsonFormatter:
+
+    def test_format_includes_extra_fields(self):
+        """Test fields passed through extra= become JSON keys"""
+        entry = json.loads(JsonFormatter().format(make_record(msg="hello %s", args=("world",), article_id=7)))
+
+        assert entry["message"] == "hello world"
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "app.test"
+        assert entry["article_id"] == 7
+        assert "pathname" not in entry
+
+
+class TestSamplingFilter:
+
+    def test_rate_zero_drops_info(self):
+        """Test a zero rate drops every record below WARNING"""
+        sampling = SamplingFilter(0.0)
+
+        assert not sampling.filter(make_record(logging.INFO))
+        assert not sampling.filter(make_record(logging.DEBUG))
+
+    def test_warnings_bypass_sampling(self):
+        """Test warnings and errors pass whatever the rate"""
+        sampling = SamplingFilter(0.0)
+
+        assert sampling.filter(make_record(logging.WARNING))
+        assert sampling.filter(make_record(logging.ERROR))
+
+    def test_parse_sampling(self):
+        """Test the LOG_SAMPLING value is parsed per logger, invalid rates skipped"""
+        rates = _parse_sampling("app.services.cache_service=0.01, app.articles.controller=0.5,broken=x,")
+
+        assert rates == {"app.services.cache_service": 0.01, "app.articles.controller": 0.5}
+
+
+class TestQueueLogging:
+
+    def run_through_queue(self, log):
+        log_queue = queue.SimpleQueue()
+        capturing = CapturingHandler()
+        listener = QueueListener(log_queue, capturing)
+        logger = logging.getLogger("app.test.queue")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        handler = _LazyQueueHandler(log_queue)
+        logger.addHandler(handler)
+        listener.start()
+        try:
+            log(logger)
+            assert capturing.done.wait(5)
+        finally:
+            listener.stop()
+            logger.removeHandler(handler)
+        return capturing.entries
+
+    def test_message_rendered_by_listener(self):
+        """Test the message is formatted on the listener thread, not when enqueued"""
+        probe = RenderProbe()
+
+        entries = self.run_through_queue(lambda logger: logger.info("value %s", probe))
+
+        assert entries[0]["message"] == "value probe"
+        assert probe.rendered_in is not None
+        assert probe.rendered_in != threading.get_ident()
+
+    def test_traceback_survives_queue(self):
+        """Test an exception logged through the queue keeps its traceback"""
+        def log_exception(logger):
+            try:
+                1 / 0
+            except ZeroDivisionError:
+                logger.exception("failed")
+
+        entries = self.run_through_queue(log_exception)
+
+        assert entries[0]["message"] == "failed"
+        assert "ZeroDivisionError" in entries[0]["exc_info"]
+        assert "Traceback" in entries[0]["exc_info"]
@@ -0,0 +1,126 @@
+import itertools
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.articles import view
+from app.articles.schema import PaginatedArticles
+from app.config import database
+from app.main import app
+from app.utils.auth_utils import API_KEY, API_KEY_NAME
+from .conftest import async_engine
+
+
+def make_request(cookie: str = "") -> Request:
+    headers = [(b"cookie", cookie.encode())] if cookie else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+async def first_yield(dependency):
+    """Session a dependency generator hands out, closing the generator after"""
+    session = await dependency.__anext__()
+    await dependency.aclose()
+    return session
+
+
+class TestReadReplicaRouting:
+
+    @pytest.fixture
+    def primary(self):
+        return AsyncSession(bind=async_engine)
+
+    @pytest.fixture
+    def replicas(self, monkeypatch):
+        """Two replica session makers, both on the test database"""
+        replica_sessions = [
+            async_sessionmaker(bind=async_engine, class_=AsyncSession, info={"replica": True, "name": name})
+            for name in ("first", "second")
+        ]
+        monkeypatch.setattr(database, "ReplicaSessionLocals", replica_sessions)
+        monkeypatch.setattr(database, "_replica_round_robin", itertools.cycle(replica_sessions))
+        return replica_sessions
+
+    @pytest.fixture
+    def no_replicas(self, monkeypatch):
+        monkeypatch.setattr(database, "ReplicaSessionLocals", [])
+        monkeypatch.setattr(database, "_replica_round_robin", itertools.cycle([]))
+
+    def test_routes_use_read_and_write_sessions(self):
+        """Test GET routes take the read session and every other route the write session"""
+        routes = [route for route in view.router.routes if isinstance(route, APIRoute)]
+        for route in routes:
+            db_dependency = next(
+                dependency.call for dependency in route.dependant.dependencies if dependency.name == "db"
+            )
+            expected = database.get_async_read_db if "GET" in route.methods else database.get_async_write_db
+            assert db_dependency is expected, route.path
+
+    @pytest.mark.asyncio
+    async def test_read_uses_replicas_in_turn(self, replicas, primary):
+        """Test reads without the cookie go to the replicas round robin"""
+        names = [
+            (await first_yield(database.get_async_read_db(make_request(), primary))).info["name"]
+            for _ in range(3)
+        ]
+
+        assert names == ["first", "second", "first"]
+
+    @pytest.mark.asyncio
+    async def test_read_primary_cookie_uses_primary(self, replicas, primary):
+        """Test a client holding the read_primary cookie reads the primary"""
+        session = await first_yield(
+            database.get_async_read_db(make_request(f"{database.READ_PRIMARY_COOKIE}=1"), primary)
+        )
+
+        assert session is primary
+        assert session.info["read_primary"] is True
+
+    @pytest.mark.asyncio
+    async def test_write_sets_read_primary_cookie(self, replicas, primary):
+        """Test writes go to the primary and make the client read it for a while"""
+        response = Response()
+
+        session = await first_yield(database.get_async_write_db(response, primary))
+
+        assert session is primary
+        cookie = response.headers["set-cookie"]
+        assert cookie.startswith(f"{database.READ_PRIMARY_COOKIE}=1")
+        assert f"Max-Age={database.REPLICA_STICKY_SECONDS}" in cookie
+
+    @pytest.mark.asyncio
+    async def test_without_replicas_everything_uses_primary(self, no_replicas, primary):
+        """Test reads fall back to the primary and writes set no cookie when no replicas are configured"""
+        response = Response()
+
+        read_session = await first_yield(database.get_async_read_db(make_request(), primary))
+        write_session = await first_yield(database.get_async_write_db(response, primary))
+
+        assert read_session is primary
+        assert "read_primary" not in read_session.info
+        assert write_session is primary
+        assert "set-cookie" not in response.headers
+
+    def test_reads_after_write_go_to_primary(self, replicas):
+        """Test the cookie set by a write sends the same client's next reads to the primary"""
+        sessions = []
+
+        async def capture_get_articles(db, **kwargs):
+            sessions.append(db)
+            return PaginatedArticles(total=0, page=1, page_size=10, articles=[])
+
+        client = TestClient(app)
+        headers = {API_KEY_NAME: API_KEY}
+        with patch("app.articles.view.get_articles", side_effect=capture_get_articles), \
+                patch("app.articles.view.delete_article", new=AsyncMock(return_value=None)):
+            client.get("/articles/", headers=headers)
+            delete_response = client.delete("/articles/1", headers=headers)
+            client.get("/articles/", headers=headers)
+
+        assert delete_response.status_code == 204
+        assert database.READ_PRIMARY_COOKIE in delete_response.cookies
+        assert sessions[0].info.get("replica") is True
+        assert sessions[1].info.get("read_primary") is True
+        assert not sessions[1].info.get("replica")